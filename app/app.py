@@ -1,26 +1,272 @@
 import sys
 import os
 import numpy as np
+import pandas as pd
+import plotly.express as px
 import plotly.graph_objects as go
 import json
+import inspect
 import streamlit as st
-from datetime import datetime
 
 # Add the parent directory to the system path for importing the module
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 from option_strategies import OptionStrategies
 
-# Load strategy insights from JSON file
-with open(os.path.join(os.path.dirname(__file__), '..', 'src', 'strategies_info.json'), 'r') as file:
-    strategy_info = json.load(file)
+STRATEGY_INFO_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'strategies_info.json')
+
+# Strategies at a single strike, composed from the (long call, long put, short call, short put) legs.
+# Each returns the leg payoffs followed by the net payoff.
+PRIMITIVE_COMPOSITES = {
+    'Long Call': lambda lc, lp, sc, sp: (lc,),
+    'Long Put': lambda lc, lp, sc, sp: (lp,),
+    'Short Call': lambda lc, lp, sc, sp: (sc,),
+    'Short Put': lambda lc, lp, sc, sp: (sp,),
+    'Long Straddle': lambda lc, lp, sc, sp: (lc, lp, lc + lp),
+    'Short Straddle': lambda lc, lp, sc, sp: (sc, sp, sc + sp),
+    'Long Synthetic': lambda lc, lp, sc, sp: (lc, sp, lc + sp),
+    'Short Synthetic': lambda lc, lp, sc, sp: (sc, lp, sc + lp),
+    'Strap': lambda lc, lp, sc, sp: (2 * lc, lp, 2 * lc + lp),
+    'Strip': lambda lc, lp, sc, sp: (lc, 2 * lp, lc + 2 * lp),
+}
+
+# Strategies with their own strikes and premiums, dispatched straight to the OptionStrategies method
+STRATEGY_DISPATCH = {
+    'Covered Call': OptionStrategies.covered_call,
+    'Covered Put': OptionStrategies.covered_put,
+    'Bull Call Spread': OptionStrategies.bull_call_spread,
+    'Bull Put Spread': OptionStrategies.bull_put_spread,
+    'Bear Call Spread': OptionStrategies.bear_call_spread,
+    'Bear Put Spread': OptionStrategies.bear_put_spread,
+    'Call Backspread': OptionStrategies.call_backspread,
+    'Put Backspread': OptionStrategies.put_backspread,
+    'Long Combo': OptionStrategies.long_combo,
+    'Long Strangle': OptionStrategies.long_strangle,
+    'Short Strangle': OptionStrategies.short_strangle,
+    'Long Call Ladder': OptionStrategies.long_call_ladder,
+    'Long Put Ladder': OptionStrategies.long_put_ladder,
+    'Short Call Ladder': OptionStrategies.short_call_ladder,
+    'Short Put Ladder': OptionStrategies.short_put_ladder,
+    'Long Call Butterfly': OptionStrategies.long_call_butterfly,
+    'Short Call Butterfly': OptionStrategies.short_call_butterfly,
+    'Long Call Condor': OptionStrategies.long_call_condor,
+    'Short Call Condor': OptionStrategies.short_call_condor,
+}
+
+# Default values for the extra strike inputs, in strike widths away from the strike price, and the premium inputs
+STRIKE_STEPS = {
+    'lower_strike': -2,
+    'lower_middle_strike': -1,
+    'middle_strike': 0,
+    'upper_middle_strike': 1,
+    'upper_strike': 2,
+}
+STRIKE_WIDTH = 5.0
+PREMIUM_DEFAULTS = {
+    'lower_premium': 5.0,
+    'lower_middle_premium': 4.0,
+    'middle_premium': 3.0,
+    'upper_middle_premium': 2.0,
+    'upper_premium': 1.0,
+    'call_premium': 5.0,
+    'put_premium': 5.0,
+}
+
+# Trace names for the individual legs of multi-leg strategies
+LEG_NAMES = {
+    'Long Straddle': ('Long Call Leg', 'Long Put Leg'),
+    'Short Straddle': ('Short Call Leg', 'Short Put Leg'),
+    'Long Synthetic': ('Long Call Leg', 'Short Put Leg'),
+    'Short Synthetic': ('Short Call Leg', 'Long Put Leg'),
+    'Strap': ('Long Calls Leg', 'Long Put Leg'),
+    'Strip': ('Long Call Leg', 'Long Puts Leg'),
+    'Covered Call': ('Long Stock Leg', 'Short Call Leg'),
+    'Covered Put': ('Short Stock Leg', 'Short Put Leg'),
+    'Bull Call Spread': ('Long Call Leg', 'Short Call Leg'),
+    'Bull Put Spread': ('Long Put Leg', 'Short Put Leg'),
+    'Bear Call Spread': ('Short Call Leg', 'Long Call Leg'),
+    'Bear Put Spread': ('Short Put Leg', 'Long Put Leg'),
+    'Call Backspread': ('Short Call Leg', 'Long Calls Leg'),
+    'Put Backspread': ('Short Put Leg', 'Long Puts Leg'),
+    'Long Combo': ('Short Put Leg', 'Long Call Leg'),
+    'Long Strangle': ('Long Put Leg', 'Long Call Leg'),
+    'Short Strangle': ('Short Put Leg', 'Short Call Leg'),
+    'Long Call Ladder': ('Lower Long Call Leg', 'Middle Short Call Leg', 'Upper Long Call Leg'),
+    'Long Put Ladder': ('Upper Long Put Leg', 'Middle Short Put Leg', 'Lower Long Put Leg'),
+    'Short Call Ladder': ('Lower Short Call Leg', 'Middle Long Call Leg', 'Upper Long Call Leg'),
+    'Short Put Ladder': ('Upper Short Put Leg', 'Middle Long Put Leg', 'Lower Long Put Leg'),
+    'Long Call Butterfly': ('Lower Long Call Leg', 'Middle Short Calls Leg', 'Upper Long Call Leg'),
+    'Short Call Butterfly': ('Lower Short Call Leg', 'Middle Long Calls Leg', 'Upper Short Call Leg'),
+    'Long Call Condor': ('Lower Long Call Leg', 'Lower Middle Short Call Leg', 'Upper Middle Short Call Leg', 'Upper Long Call Leg'),
+    'Short Call Condor': ('Lower Short Call Leg', 'Lower Middle Long Call Leg', 'Upper Middle Long Call Leg', 'Upper Short Call Leg'),
+}
+LEG_COLORS = ('blue', 'purple', 'orange', 'brown')
+
+# Number of spot prices sampled for the diagram
+GRID_POINTS = 200
+
+# Upper bound on the memoized payoff arrays and figures, so slider sweeps do not grow the cache forever
+CACHE_ENTRIES = 128
+
+
+@st.cache_data
+def load_strategy_info(path):
+    # Load strategy insights from JSON file once instead of on every rerun
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+@st.cache_data
+def categorize_strategies(path):
+    # Categorize strategies into Basic and Advanced
+    strategy_info = load_strategy_info(path)
+    categories = {'Basic': [], 'Advanced': []}
+    for key, value in strategy_info.items():
+        categories[value['Category']].append(key)
+    return categories
+
+
+@st.cache_data
+def make_grid(lower_bound, upper_bound, n=GRID_POINTS):
+    # Dynamic range of spot prices for plotting, shared by every rerun with the same bounds.
+    # float32 is plenty for a pixel plot and halves the data sent to the browser.
+    return np.linspace(lower_bound, upper_bound, n, dtype=np.float32)
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def primitive_legs(strike_price, premium, lower_bound, upper_bound, n):
+    # The four single-leg payoffs at the user's strike and premium, evaluated once per grid.
+    # The short legs are the negated long legs, so only the long call and long put are evaluated.
+    spot_prices = make_grid(lower_bound, upper_bound, n)
+    strategies = OptionStrategies(strike=strike_price, dtype=np.float32)
+    long_call = strategies.long_call(spot_prices, premium)
+    long_put = strategies.long_put(spot_prices, premium)
+    return long_call, long_put, -long_call, -long_put
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def compute_payoffs(strategy_name, strike_price, premium, leg_params, lower_bound, upper_bound, n):
+    # Leg and net payoff arrays over the spot grid, memoized on the strategy inputs and grid
+    if strategy_name in STRATEGY_DISPATCH:
+        spot_prices = make_grid(lower_bound, upper_bound, n)
+
+        # Initialize the strategy object dynamically based on user inputs
+        strategies = OptionStrategies(strike=strike_price, dtype=np.float32)
+        return STRATEGY_DISPATCH[strategy_name](strategies, spot_prices, *leg_params)
+
+    # Single strike strategies are plain arithmetic on the shared primitive legs
+    lc, lp, sc, sp = primitive_legs(strike_price, premium, lower_bound, upper_bound, n)
+    if strategy_name in PRIMITIVE_COMPOSITES:
+        return PRIMITIVE_COMPOSITES[strategy_name](lc, lp, sc, sp)
+
+    # Default to long call if no strategy selected
+    return (lc,)
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def build_figure(strategy_name, strike_price, premium, leg_params):
+    # Build the payoff diagram for one parameter tuple. The figure is returned as a
+    # dict so unchanged inputs reuse the already computed and serialized traces.
+
+    # Define the range of spot prices dynamically based on strike price
+    range_multiplier = 1.5
+    lower_bound = max(0, strike_price - strike_price * range_multiplier)
+    upper_bound = strike_price + strike_price * range_multiplier
+
+    spot_prices = make_grid(lower_bound, upper_bound, GRID_POINTS)
+    leg_payoffs = compute_payoffs(strategy_name, strike_price, premium, leg_params, lower_bound, upper_bound, GRID_POINTS)
+    *legs, payoffs = leg_payoffs
+
+    # Adjust the plot to include all lines computed for this strategy.
+    # Multi-leg strategies already return one contiguous array of rows, so this is no copy for them.
+    stacked = np.asarray(leg_payoffs)
+    y_min, y_max = stacked.min() - 10, stacked.max() + 10
+
+    # Plot configuration using conditional fill, rendered with WebGL traces.
+    # The line traces are built in one px.line call from a wide frame indexed by spot price.
+    if legs:
+        # Adding individual legs to the plot
+        lines = pd.DataFrame(stacked[:-1].T, index=spot_prices, columns=LEG_NAMES[strategy_name])
+        fig = px.line(lines, render_mode='webgl', color_discrete_sequence=LEG_COLORS)
+        fig.update_traces(line_width=2)
+
+    else:
+        lines = pd.DataFrame({'Total Payoff': payoffs}, index=spot_prices)
+        fig = px.line(lines, render_mode='webgl', color_discrete_sequence=['green'])
+        fig.update_traces(line_width=3)
+
+    # Split the net payoff into its profit (above zero) and loss (below zero) parts
+    profits = np.where(payoffs > 0, payoffs, 0.0)
+    losses = np.where(payoffs < 0, payoffs, 0.0)
+
+    # Plotting profits (above zero)
+    fig.add_trace(go.Scattergl(x=spot_prices, y=profits, mode='lines', name='Profit', line=dict(color='green', width=3), fill='tozeroy'))
+
+    # Plotting losses (below zero)
+    fig.add_trace(go.Scattergl(x=spot_prices, y=losses, mode='lines', name='Loss', line=dict(color='red', width=3), fill='tozeroy'))
+
+    fig.update_layout(
+        title=f"Payoff Diagram for {strategy_name}",
+        xaxis_title='Spot Price',
+        yaxis_title='Payoff',
+        yaxis_range=[y_min, y_max],
+        legend_title_text=None,
+        plot_bgcolor='white'
+    )
+
+    return fig.to_dict()
+
+
+@st.fragment
+def render_payoff(strategy_name):
+    # Strategy parameters and the payoff diagram live in one fragment, so changing a
+    # parameter reruns only this block and not the strategy selection and insights.
+    # Fragments cannot write to the sidebar, hence the inputs sit above the chart.
+    with st.expander('Strategy Parameters', expanded=True):
+        columns = st.columns(3)
+
+        # Initialize user input variables for strategy parameters
+        spot_price = columns[0].number_input('Spot Price', value=100.0)
+        strike_price = columns[1].number_input('Strike Price', value=40.0)  # User-defined strike price
+        premium = columns[2].number_input('Premium', value=10.0)  # For single-leg strategies
+
+        # Strategy specific inputs are collected up-front so the figure can be cached on them.
+        # They follow the strategy method's own arguments after spot, e.g. lower_strike -> 'Lower Strike Price'.
+        leg_params = ()
+        if strategy_name in STRATEGY_DISPATCH:
+            method = STRATEGY_DISPATCH[strategy_name]
+            params = [
+                name for name, param in inspect.signature(method).parameters.items()
+                if name not in ('self', 'spot') and param.default is inspect.Parameter.empty
+            ]
+            # The distance between neighbouring strikes sets where the strike inputs start out
+            n_inputs = 0
+            if any(param in STRIKE_STEPS for param in params):
+                strike_width = columns[0].number_input('Strike Width', value=STRIKE_WIDTH, min_value=0.0)
+                n_inputs = 1
+            for i, param in enumerate(params, start=n_inputs):
+                label = param.replace('_', ' ').title()
+                column = columns[i % len(columns)]
+                if param in STRIKE_STEPS:
+                    value = column.number_input(f'{label} Price', value=strike_price + STRIKE_STEPS[param] * strike_width)
+                else:
+                    value = column.number_input(label, value=PREMIUM_DEFAULTS[param])
+                leg_params += (value,)
+
+    # The strategy methods raise ValueError unless their strikes are in order, e.g. lower below upper
+    try:
+        figure = build_figure(strategy_name, strike_price, premium, leg_params)
+    except ValueError as error:
+        st.error(str(error))
+        return
+    st.plotly_chart(go.Figure(figure), use_container_width=True, key='payoff_chart')
+
+
+strategy_info = load_strategy_info(STRATEGY_INFO_PATH)
 
 st.title('Options Strategy Visualizer')
 st.sidebar.header('Strategy Selection')
 
-# Categorize strategies into Basic and Advanced
-categories = {'Basic': [], 'Advanced': []}
-for key, value in strategy_info.items():
-    categories[value['Category']].append(key)
+categories = categorize_strategies(STRATEGY_INFO_PATH)
 
 # User selects the strategy type
 strategy_type = st.sidebar.selectbox('Choose Strategy Type', ['Basic', 'Advanced'])
@@ -28,23 +274,6 @@ strategy_type = st.sidebar.selectbox('Choose Strategy Type', ['Basic', 'Advanced
 # Display the corresponding strategies based on user selection
 strategy_name = st.sidebar.selectbox('Select a Strategy', categories[strategy_type])
 
-# Initialize user input variables for strategy parameters
-spot_price = st.sidebar.number_input('Spot Price', value=100.0)
-strike_price = st.sidebar.number_input('Strike Price', value=40.0)  # User-defined strike price
-
-# Define the range of spot prices dynamically based on strike price
-range_multiplier = 1.5
-lower_bound = max(0, strike_price - strike_price * range_multiplier)
-upper_bound = strike_price + strike_price * range_multiplier
-
-# Dynamic range of spot prices for plotting
-spot_prices = np.linspace(lower_bound, upper_bound, 300)
-
-# Initialize the strategy object dynamically based on user inputs
-strategies = OptionStrategies(strike=strike_price)
-
-premium = st.sidebar.number_input('Premium', value=10.0)  # For single-leg strategies
-
 # Displaying the selected strategy insights
 info = strategy_info[strategy_name]
 # st.write(f"### Strategy Insights: {strategy_name}")
@@ -53,45 +282,4 @@ st.write(f"**Risk:** {info['Risk']}")
 st.write(f"**Reward:** {info['Reward']}")
 st.write(f"**Breakeven:** {info['Breakeven'].replace('\\n', '<br>')}", unsafe_allow_html=True)
 
-# Plot configuration using conditional fill
-fig = go.Figure()
-
-if strategy_name == 'Bull Call Spread':
-    lower_strike = st.sidebar.number_input('Lower Strike Price', value=strike_price - 10)
-    upper_strike = st.sidebar.number_input('Upper Strike Price', value=strike_price + 10)
-    lower_premium = st.sidebar.number_input('Lower Premium', value=5.0)
-    upper_premium = st.sidebar.number_input('Upper Premium', value=1.0)
-    
-    # Calculating individual leg payoffs
-    long_call_payoffs = np.vectorize(lambda spot: strategies.long_call(spot, lower_strike, lower_premium))(spot_prices)
-    short_call_payoffs = np.vectorize(lambda spot: strategies.short_call(spot, upper_strike, upper_premium))(spot_prices)
-    total_payoffs = long_call_payoffs + short_call_payoffs
-    
-    # Adding individual legs to the plot
-    fig.add_trace(go.Scatter(x=spot_prices, y=long_call_payoffs, mode='lines', name='Long Call Leg', line=dict(color='blue', width=2)))
-    fig.add_trace(go.Scatter(x=spot_prices, y=short_call_payoffs, mode='lines', name='Short Call Leg', line=dict(color='purple', width=2)))
-
-else:
-    # Default to long call if no strategy selected
-    payoffs = np.vectorize(lambda spot: strategies.long_call(spot, premium))(spot_prices)
-    fig.add_trace(go.Scatter(x=spot_prices, y=payoffs, mode='lines', name='Total Payoff', line=dict(color='green', width=3)))
-
-# Adjust the plot to include all lines
-y_min = np.min([long_call_payoffs.min(), short_call_payoffs.min(), total_payoffs.min()]) - 10
-y_max = np.max([long_call_payoffs.max(), short_call_payoffs.max(), total_payoffs.max()]) + 10
-
-# Plotting profits (above zero)
-fig.add_trace(go.Scatter(x=spot_prices, y=np.maximum(payoffs, 0), mode='lines', name='Profit', line=dict(color='green', width=3), fill='tozeroy'))
-
-# Plotting losses (below zero)
-fig.add_trace(go.Scatter(x=spot_prices, y=np.minimum(payoffs, 0), mode='lines', name='Loss', line=dict(color='red', width=3), fill='tozeroy'))
-
-fig.update_layout(
-    title=f"Payoff Diagram for {strategy_name}",
-    xaxis_title='Spot Price',
-    yaxis_title='Payoff',
-    yaxis_range=[y_min, y_max],
-    plot_bgcolor='white'
-)
-
-st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+render_payoff(strategy_name)
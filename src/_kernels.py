@@ -0,0 +1,392 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Numba is optional and is imported by has_numba on first use, not here: it takes most of the
+# module's import time, and a caller that never reaches a kernel should not pay for it.
+njit = None
+prange = range
+_numba_checked = False
+
+try:
+    import _payoff_core
+except ImportError:  # The precompiled extension is optional too, see the README for building it
+    _payoff_core = None
+
+# Floating point types the Numba kernels are compiled for, float16 and longdouble stay on NumPy
+KERNEL_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+# Spot grids at least this long are split across cores, smaller ones stay on one thread
+PARALLEL_THRESHOLD = 100_000
+
+# CuPy elementwise kernel for strategy_payoff_gpu, built on first use
+_gpu_strategy_kernel = None
+
+# Generated book kernels from compile_book, keyed by the call/put flag of every leg,
+# least recently used first and evicted past MAX_COMPILED_BOOKS
+_compiled_books = OrderedDict()
+MAX_COMPILED_BOOKS = 32
+
+# Books with more legs than this are not unrolled, as compile time grows with the leg count
+MAX_UNROLLED_LEGS = 16
+
+
+def has_numba():
+    '''
+    Whether Numba is installed. The first call imports it and sets up the kernels.
+
+    Returns:
+        bool: True if the Numba kernels can be used
+    '''
+    global _numba_checked, njit, prange
+    if not _numba_checked:
+        _numba_checked = True
+        try:
+            from numba import njit, prange
+        except ImportError:  # OptionStrategies falls back to plain NumPy
+            return False
+        _build_kernels()
+    return njit is not None
+
+
+def accepts(spot):
+    '''
+    Whether the compiled kernels can handle the given spot input.
+
+    Args:
+        spot: The spot price(s) passed to a payoff method
+
+    Returns:
+        bool: True if Numba or the precompiled extension can take spot, a 1-D float32 or float64 array
+    '''
+    if not (isinstance(spot, np.ndarray) and spot.ndim == 1 and spot.dtype in KERNEL_DTYPES):
+        return False
+    # The extension is checked first, so it alone never triggers the Numba import
+    return _core_accepts(spot) or has_numba()
+
+
+def accepts_fused(spot):
+    '''
+    Whether the fused multi-leg kernels, which are Numba only, can handle the given spot input.
+
+    Args:
+        spot: The spot price(s) passed to a payoff method
+
+    Returns:
+        bool: True if Numba is available and spot is a 1-D float32 or float64 array
+    '''
+    return isinstance(spot, np.ndarray) and spot.ndim == 1 and spot.dtype in KERNEL_DTYPES and has_numba()
+
+
+def accepts_precompiled(spot):
+    '''
+    Whether the precompiled extension is built and can take the given spot input.
+
+    Args:
+        spot: The spot price(s) passed to a payoff method
+
+    Returns:
+        bool: True if the extension is available and spot is a 1-D contiguous float64 array
+    '''
+    return isinstance(spot, np.ndarray) and spot.ndim == 1 and _core_accepts(spot)
+
+
+def _core_accepts(spot, out=None):
+    # The precompiled loops are typed on contiguous float64 buffers only
+    buffers = (spot,) if out is None else (spot, out)
+    return _payoff_core is not None and all(b.dtype == np.float64 and b.flags.c_contiguous for b in buffers)
+
+
+def _call_loop(spot, strike, premium, sign, out):
+    # out[i] = sign * (max(spot[i] - strike, 0) - premium)
+    for i in prange(spot.shape[0]):
+        intrinsic_value = spot[i] - strike
+        if intrinsic_value < 0.0:
+            intrinsic_value = 0.0
+        out[i] = sign * (intrinsic_value - premium)
+
+
+def _put_loop(spot, strike, premium, sign, out):
+    # out[i] = sign * (max(strike - spot[i], 0) - premium)
+    for i in prange(spot.shape[0]):
+        intrinsic_value = strike - spot[i]
+        if intrinsic_value < 0.0:
+            intrinsic_value = 0.0
+        out[i] = sign * (intrinsic_value - premium)
+
+
+def _strategy_loop(spot, strikes, coeffs, is_call, net_premium, out):
+    # out[i] = sum_j coeffs[j] * intrinsic_j(spot[i]) - net_premium, one pass over spot for all legs
+    for i in prange(spot.shape[0]):
+        total = -net_premium
+        for j in range(strikes.shape[0]):
+            if is_call[j]:
+                intrinsic_value = spot[i] - strikes[j]
+            else:
+                intrinsic_value = strikes[j] - spot[i]
+            if intrinsic_value > 0.0:
+                total += coeffs[j] * intrinsic_value
+        out[i] = total
+
+
+def _legs_loop(spot, strikes, premiums, coeffs, is_call, out):
+    # out[j, i] = coeffs[j] * (intrinsic_j(spot[i]) - premiums[j]) per leg, net payoff in the last row
+    n_legs = strikes.shape[0]
+    for i in prange(spot.shape[0]):
+        total = 0.0
+        for j in range(n_legs):
+            if is_call[j]:
+                intrinsic_value = spot[i] - strikes[j]
+            else:
+                intrinsic_value = strikes[j] - spot[i]
+            if intrinsic_value < 0.0:
+                intrinsic_value = 0.0
+            leg_payoff = coeffs[j] * (intrinsic_value - premiums[j])
+            out[j, i] = leg_payoff
+            total += leg_payoff
+        out[n_legs, i] = total
+
+
+def _build_kernels():
+    # Wraps the loops above once Numba is imported, compilation itself still waits for the first call.
+    # The loops read prange as a global when compiled, by then it is numba.prange.
+    global _call_serial, _call_parallel, _put_serial, _put_parallel
+    global _strategy_serial, _strategy_parallel, _legs_serial, _legs_parallel
+    # cache=True stores the compiled machine code next to the module, so only the first run pays for compilation
+    _call_serial = njit(cache=True, fastmath=True)(_call_loop)
+    _call_parallel = njit(cache=True, fastmath=True, parallel=True)(_call_loop)
+    _put_serial = njit(cache=True, fastmath=True)(_put_loop)
+    _put_parallel = njit(cache=True, fastmath=True, parallel=True)(_put_loop)
+    # nogil so batches of positions can run the serial kernel on several threads at once
+    _strategy_serial = njit(cache=True, fastmath=True, nogil=True)(_strategy_loop)
+    _strategy_parallel = njit(cache=True, fastmath=True, parallel=True)(_strategy_loop)
+    _legs_serial = njit(cache=True, fastmath=True)(_legs_loop)
+    _legs_parallel = njit(cache=True, fastmath=True, parallel=True)(_legs_loop)
+
+
+def call_payoff(spot, strike, premium, sign, out=None):
+    '''
+    Single pass call payoff: sign * (max(spot - strike, 0) - premium).
+
+    Args:
+        spot (np.ndarray): 1-D floating point spot prices
+        strike (float): Strike price of the call
+        premium (float): Premium of the call
+        sign (float): 1.0 for a long call, -1.0 for a short call
+        out (np.ndarray, optional): Preallocated output buffer shaped like spot
+
+    Returns:
+        np.ndarray: The net payoff, written into out if given
+    '''
+    if out is None:
+        out = np.empty_like(spot)
+    if _core_accepts(spot, out):
+        # No compilation on first use, so the extension wins over Numba when it is built
+        _payoff_core.call_payoff(spot, strike, premium, sign, out, spot.shape[0] >= PARALLEL_THRESHOLD)
+        return out
+    kernel = _call_parallel if spot.shape[0] >= PARALLEL_THRESHOLD else _call_serial
+    kernel(spot, strike, premium, sign, out)
+    return out
+
+
+def put_payoff(spot, strike, premium, sign, out=None):
+    '''
+    Single pass put payoff: sign * (max(strike - spot, 0) - premium).
+
+    Args:
+        spot (np.ndarray): 1-D floating point spot prices
+        strike (float): Strike price of the put
+        premium (float): Premium of the put
+        sign (float): 1.0 for a long put, -1.0 for a short put
+        out (np.ndarray, optional): Preallocated output buffer shaped like spot
+
+    Returns:
+        np.ndarray: The net payoff, written into out if given
+    '''
+    if out is None:
+        out = np.empty_like(spot)
+    if _core_accepts(spot, out):
+        # No compilation on first use, so the extension wins over Numba when it is built
+        _payoff_core.put_payoff(spot, strike, premium, sign, out, spot.shape[0] >= PARALLEL_THRESHOLD)
+        return out
+    kernel = _put_parallel if spot.shape[0] >= PARALLEL_THRESHOLD else _put_serial
+    kernel(spot, strike, premium, sign, out)
+    return out
+
+
+def strategy_payoff(spot, strikes, coeffs, is_call, net_premium, out=None, parallel=None):
+    '''
+    Single pass multi-leg payoff: sum(coeffs * intrinsic) - net_premium per spot price.
+
+    Args:
+        spot (np.ndarray): 1-D floating point spot prices
+        strikes (np.ndarray): Strike price per leg
+        coeffs (np.ndarray): Signed quantity per leg, negative for short legs
+        is_call (np.ndarray): True for call legs, False for put legs
+        net_premium (float): Net premium paid for all legs
+        out (np.ndarray, optional): Preallocated output buffer shaped like spot
+        parallel (bool, optional): Split spot across cores, defaults to len(spot) >= PARALLEL_THRESHOLD
+
+    Returns:
+        np.ndarray: The net payoff, written into out if given
+    '''
+    if out is None:
+        out = np.empty_like(spot)
+    if parallel is None:
+        parallel = spot.shape[0] >= PARALLEL_THRESHOLD
+    kernel = _strategy_parallel if parallel else _strategy_serial
+    kernel(spot, strikes, coeffs, is_call, net_premium, out)
+    return out
+
+
+def leg_matrix(spot, strikes, premiums, coeffs, is_call, out=None):
+    '''
+    Single pass over spot filling every leg payoff and the net payoff of a strategy.
+
+    Args:
+        spot (np.ndarray): 1-D floating point spot prices
+        strikes (np.ndarray): Strike price per leg
+        premiums (np.ndarray): Premium per leg
+        coeffs (np.ndarray): Signed quantity per leg, negative for short legs
+        is_call (np.ndarray): True for call legs, False for put legs
+        out (np.ndarray, optional): Preallocated (number of legs + 1, len(spot)) output buffer
+
+    Returns:
+        np.ndarray: One row per leg followed by the net payoff row, written into out if given
+    '''
+    if out is None:
+        out = np.empty((strikes.shape[0] + 1, spot.shape[0]), dtype=spot.dtype)
+    kernel = _legs_parallel if spot.shape[0] >= PARALLEL_THRESHOLD else _legs_serial
+    kernel(spot, strikes, premiums, coeffs, is_call, out)
+    return out
+
+
+def portfolio_payoff(spot, strikes, weights, is_call, net_premium, out=None):
+    '''
+    Portfolio payoff through the precompiled extension: sum(weights * intrinsic) - net_premium per spot price.
+
+    Args:
+        spot (np.ndarray): 1-D contiguous float64 spot prices
+        strikes (np.ndarray): Strike price per leg
+        weights (np.ndarray): Signed quantity per leg, zero for expired legs
+        is_call (np.ndarray): True for call legs, False for put legs
+        net_premium (float): Net premium paid for all legs
+        out (np.ndarray, optional): Preallocated float64 output buffer shaped like spot
+
+    Returns:
+        np.ndarray: The net payoff, written into out if given
+    '''
+    if out is None:
+        out = np.empty_like(spot)
+    _payoff_core.portfolio_payoff(
+        spot,
+        np.ascontiguousarray(strikes, dtype=np.float64),
+        np.ascontiguousarray(weights, dtype=np.float64),
+        np.ascontiguousarray(is_call, dtype=np.bool_).view(np.uint8),
+        net_premium,
+        out,
+        spot.shape[0] >= PARALLEL_THRESHOLD,
+    )
+    return out
+
+
+def strategy_payoff_gpu(spot, strikes, coeffs, is_call, net_premium):
+    '''
+    Multi-leg payoff on the GPU as one fused CuPy elementwise kernel launch.
+    CuPy is imported here, so it is only needed by callers of this function.
+
+    Args:
+        spot (cupy.ndarray): Floating point spot prices on the device
+        strikes (np.ndarray): Strike price per leg
+        coeffs (np.ndarray): Signed quantity per leg, negative for short legs
+        is_call (np.ndarray): True for call legs, False for put legs
+        net_premium (float): Net premium paid for all legs
+
+    Returns:
+        cupy.ndarray: The net payoff, left on the device
+    '''
+    global _gpu_strategy_kernel
+    import cupy as cp
+
+    if _gpu_strategy_kernel is None:
+        _gpu_strategy_kernel = cp.ElementwiseKernel(
+            'T s, raw T strikes, raw T coeffs, raw bool is_call, int32 n_legs, T net_premium',
+            'T out',
+            '''
+            T total = -net_premium;
+            for (int j = 0; j < n_legs; ++j) {
+                T intrinsic_value = is_call[j] ? s - strikes[j] : strikes[j] - s;
+                if (intrinsic_value > 0) total += coeffs[j] * intrinsic_value;
+            }
+            out = total;
+            ''',
+            'strategy_payoff',
+        )
+    dtype = spot.dtype
+    return _gpu_strategy_kernel(
+        spot,
+        cp.asarray(strikes, dtype=dtype),
+        cp.asarray(coeffs, dtype=dtype),
+        cp.asarray(is_call, dtype=np.bool_),
+        np.int32(len(strikes)),
+        dtype.type(net_premium),
+    )
+
+
+def compile_book(is_call):
+    '''
+    Generate and JIT a payoff kernel specialized to one portfolio shape.
+    The leg count and the call/put flag of each leg are baked into the source, so the leg loop
+    is fully unrolled with no per-leg type branch. Strikes and weights stay arguments, so books
+    with the same shape share one compiled kernel.
+    The generated source has no file for Numba to cache against, so it compiles once per process,
+    and at most MAX_COMPILED_BOOKS shapes are kept. Books over MAX_UNROLLED_LEGS legs get the
+    cached generic strategy_payoff kernel instead of generated source.
+
+    Args:
+        is_call (tuple): True for call legs, False for put legs, in leg order
+
+    Returns:
+        callable: book_payoff(spot, strikes, weights, net_premium, out=None) returning the net payoff per spot
+    '''
+    is_call = tuple(bool(flag) for flag in is_call)
+    if len(is_call) > MAX_UNROLLED_LEGS:
+        # Large books run the generic leg loop of strategy_payoff, compiled once for every shape
+        flags = np.array(is_call, dtype=np.bool_)
+
+        def generic_book_payoff(spot, strikes, weights, net_premium, out=None):
+            return strategy_payoff(spot, strikes, weights, flags, net_premium, out)
+
+        return generic_book_payoff
+    if is_call in _compiled_books:
+        _compiled_books.move_to_end(is_call)
+        return _compiled_books[is_call]
+
+    # net_premium is a Python float, so total accumulates in float64 even for float32 books
+    lines = [
+        'def _book_loop(spot, strikes, weights, net_premium, out):',
+        '    for i in prange(spot.shape[0]):',
+        '        s = spot[i]',
+        '        total = -net_premium',
+    ]
+    for j, flag in enumerate(is_call):
+        lines.append(f'        x = s - strikes[{j}]' if flag else f'        x = strikes[{j}] - s')
+        lines.append('        if x > 0.0:')
+        lines.append(f'            total += weights[{j}] * x')
+    lines.append('        out[i] = total')
+    namespace = {'prange': prange}
+    exec(compile('\n'.join(lines), f'<book kernel, {len(is_call)} legs>', 'exec'), namespace)
+    serial = njit(fastmath=True)(namespace['_book_loop'])
+    parallel = njit(fastmath=True, parallel=True)(namespace['_book_loop'])
+
+    def book_payoff(spot, strikes, weights, net_premium, out=None):
+        if out is None:
+            out = np.empty_like(spot)
+        kernel = parallel if spot.shape[0] >= PARALLEL_THRESHOLD else serial
+        kernel(spot, strikes, weights, net_premium, out)
+        return out
+
+    _compiled_books[is_call] = book_payoff
+    if len(_compiled_books) > MAX_COMPILED_BOOKS:
+        _compiled_books.popitem(last=False)
+    return book_payoff
@@ -0,0 +1,66 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+from cython.parallel import prange
+
+
+cdef inline double relu(double x) noexcept nogil:
+    return x if x > 0.0 else 0.0
+
+
+def call_payoff(const double[::1] spot, double strike, double premium, double sign, double[::1] out, bint parallel=True):
+    '''
+    Precompiled call payoff: out = sign * (max(spot - strike, 0) - premium).
+
+    Args:
+        spot (np.ndarray): 1-D contiguous float64 spot prices
+        strike (float): Strike price of the call
+        premium (float): Premium of the call
+        sign (float): 1.0 for a long call, -1.0 for a short call
+        out (np.ndarray): Contiguous float64 output buffer shaped like spot
+        parallel (bool): Split spot across OpenMP threads, small grids skip the thread team startup
+    '''
+    cdef Py_ssize_t i, n = spot.shape[0]
+    for i in prange(n, nogil=True, schedule='static', use_threads_if=parallel):
+        out[i] = sign * (relu(spot[i] - strike) - premium)
+
+
+def put_payoff(const double[::1] spot, double strike, double premium, double sign, double[::1] out, bint parallel=True):
+    '''
+    Precompiled put payoff: out = sign * (max(strike - spot, 0) - premium).
+
+    Args:
+        spot (np.ndarray): 1-D contiguous float64 spot prices
+        strike (float): Strike price of the put
+        premium (float): Premium of the put
+        sign (float): 1.0 for a long put, -1.0 for a short put
+        out (np.ndarray): Contiguous float64 output buffer shaped like spot
+        parallel (bool): Split spot across OpenMP threads, small grids skip the thread team startup
+    '''
+    cdef Py_ssize_t i, n = spot.shape[0]
+    for i in prange(n, nogil=True, schedule='static', use_threads_if=parallel):
+        out[i] = sign * (relu(strike - spot[i]) - premium)
+
+
+def portfolio_payoff(const double[::1] spot, const double[::1] strikes, const double[::1] weights, const unsigned char[::1] is_call, double net_premium, double[::1] out, bint parallel=True):
+    '''
+    Precompiled portfolio payoff: out = sum(weights * intrinsic) - net_premium per spot price.
+
+    Args:
+        spot (np.ndarray): 1-D contiguous float64 spot prices
+        strikes (np.ndarray): Contiguous float64 strike price per leg
+        weights (np.ndarray): Contiguous float64 signed quantity per leg, zero for expired legs
+        is_call (np.ndarray): Contiguous uint8 flag per leg, 1 for calls and 0 for puts
+        net_premium (float): Net premium paid for all legs
+        out (np.ndarray): Contiguous float64 output buffer shaped like spot
+        parallel (bool): Split spot across OpenMP threads, small grids skip the thread team startup
+    '''
+    cdef Py_ssize_t i, j, n = spot.shape[0], n_legs = strikes.shape[0]
+    cdef double total, intrinsic_value
+    for i in prange(n, nogil=True, schedule='static', use_threads_if=parallel):
+        total = -net_premium
+        for j in range(n_legs):
+            if is_call[j]:
+                intrinsic_value = spot[i] - strikes[j]
+            else:
+                intrinsic_value = strikes[j] - spot[i]
+            total = total + weights[j] * relu(intrinsic_value)
+        out[i] = total
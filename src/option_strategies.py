@@ -1,71 +1,480 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime,timezone
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime,timedelta,timezone
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import NamedTuple
+
+import _kernels
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NEVER_NS = np.iinfo(np.int64).max
+_DATE_FORMAT = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def call_intrinsic(spot, strike):
+    '''
+    Args:
+        spot (float or np.ndarray): The current spot price(s) of the underlying asset
+        strike (float): Strike price of the call
+
+    Returns:
+        float or np.ndarray: Intrinsic value max(spot - strike, 0)
+    '''
+    return _ramp(np.subtract(_as_spot(spot), strike))
+
+
+def put_intrinsic(spot, strike):
+    '''
+    Args:
+        spot (float or np.ndarray): The current spot price(s) of the underlying asset
+        strike (float): Strike price of the put
+
+    Returns:
+        float or np.ndarray: Intrinsic value max(strike - spot, 0)
+    '''
+    return _ramp(np.subtract(strike, _as_spot(spot)))
+
+
+def _ramp(x, scratch=None):
+    '''
+    Branchless max(x, 0) as 0.5 * (x + |x|), written back into x when x is an array.
+    abs/add/multiply are plain data-parallel ufunc loops, unlike the compare in np.maximum.
+
+    Args:
+        x (float or np.ndarray): Values to clamp at zero, overwritten when an array
+        scratch (np.ndarray, optional): Buffer shaped like x to hold |x|
+
+    Returns:
+        float or np.ndarray: max(x, 0)
+    '''
+    if not isinstance(x, np.ndarray):
+        return 0.5 * (x + np.abs(x))
+    scratch = np.abs(x, out=scratch)
+    np.add(x, scratch, out=x)
+    x *= 0.5
+    return x
+
+
+def _parse_expiration(expiration):
+    # 'YYYY-MM-DD' strings and naive datetimes are taken as UTC
+    if isinstance(expiration, str):
+        # The shape check rejects malformed input up front, strptime then only has to validate the date itself
+        if _DATE_FORMAT.fullmatch(expiration) is None:
+            raise ValueError("Expiration must be in YYYY-MM-DD format.")
+        expiration = datetime.strptime(expiration, '%Y-%m-%d')
+    elif expiration is not None and not isinstance(expiration, datetime):
+        raise ValueError("Expiration must be a datetime or a YYYY-MM-DD string.")
+    if expiration is not None and expiration.tzinfo is None:
+        expiration = expiration.replace(tzinfo=timezone.utc)
+    return expiration
+
+
+def _epoch_ns(expiration):
+    # Aware datetime as int64 nanoseconds since the Unix epoch, in integer arithmetic so no precision is lost.
+    # No expiration maps to the largest int64, which no clock reading passes. Dates past 2262-04-11
+    # (e.g. a 9999-12-31 'never' sentinel) or before 1677 are clamped to the int64 range.
+    if expiration is None:
+        return _NEVER_NS
+    ns = (expiration - _EPOCH) // timedelta(microseconds=1) * 1000
+    return max(min(ns, _NEVER_NS), -_NEVER_NS)
+
+
+def _now_ns(now=None):
+    # The clock as epoch nanoseconds, one time_ns call unless a time is given
+    return time.time_ns() if now is None else _epoch_ns(_parse_expiration(now))
+
+
+def _payoff_dtype(dtype):
+    # Payoffs are float32 or float64, the types every kernel and NumPy path is written for
+    dtype = np.dtype(dtype)
+    if dtype not in _kernels.KERNEL_DTYPES:
+        raise ValueError("dtype must be np.float32 or np.float64.")
+    return dtype
+
+
+def _as_spot(spot, dtype=None):
+    # Lists and integer prices are promoted to float64 once; float arrays keep their dtype unless one is given
+    spot = np.asarray(spot, dtype=dtype)
+    if spot.dtype.kind != 'f':
+        spot = spot.astype(np.float64)
+    return spot
+
+
+def _call_payoff_inplace(spot, strike, premium, out, sign=1.0, scratch=None):
+    '''
+    Call leg payoff sign * (max(spot - strike, 0) - premium) written into out,
+    so the leg touches one buffer instead of allocating a temporary per operation.
+
+    Args:
+        spot (np.ndarray): The spot prices of the underlying asset
+        strike (float): Strike price of the call
+        premium (float): Premium of the call
+        out (np.ndarray): Buffer shaped like spot receiving the payoff
+        sign (float): Signed quantity, 1 for a long call and -1 for a short call
+        scratch (np.ndarray, optional): Buffer shaped like spot reused for the ramp
+
+    Returns:
+        np.ndarray: out
+    '''
+    np.subtract(spot, strike, out=out)
+    return _finish_leg(out, premium, sign, scratch)
+
+
+def _put_payoff_inplace(spot, strike, premium, out, sign=1.0, scratch=None):
+    '''
+    Put leg payoff sign * (max(strike - spot, 0) - premium) written into out.
+    Arguments as for _call_payoff_inplace.
+    '''
+    np.subtract(strike, spot, out=out)
+    return _finish_leg(out, premium, sign, scratch)
+
+
+def _finish_leg(out, premium, sign, scratch):
+    # Turns the signed moneyness in out into the leg payoff, in place
+    _ramp(out, scratch)
+    out -= premium
+    if sign != 1:
+        out *= sign
+    return out
+
+
+@lru_cache(maxsize=4096)
+def _scalar_payoff(spot, strike, premium, is_call, is_long):
+    # Memoized single spot leg payoff, strike searches and solvers revisit the same few (spot, strike, premium) points
+    intrinsic_value = max(spot - strike, 0.0) if is_call else max(strike - spot, 0.0)
+    net_payoff = intrinsic_value - premium
+    return net_payoff if is_long else -net_payoff
+
+
+def _payoff(spot, strike, premium, is_call, is_long, expired, dtype=None):
+    '''
+    Net payoff of a single option leg, shared by the four primitive legs.
+    Expiry is checked once up front: an expired leg is just its premium, with no pass over spot.
+
+    Args:
+        spot (float or np.ndarray): The current spot price(s) of the underlying asset
+        strike (float): Strike price of the leg
+        premium (float): Premium paid (long) or received (short) for the leg
+        is_call (bool): True for a call, False for a put
+        is_long (bool): True for a long leg, False for a short leg
+        expired (bool): Whether the option has expired, leaving only the premium
+        dtype (np.dtype, optional): Floating point type to cast spot to
+
+    Returns:
+        net_payoff (float or np.ndarray): The net payoff from the leg
+    '''
+    if dtype is None and not expired and isinstance(spot, (int, float)):
+        return _scalar_payoff(float(spot), float(strike), float(premium), is_call, is_long)
+    spot = _as_spot(spot, dtype)
+    sign = 1.0 if is_long else -1.0
+    if expired:
+        return np.full_like(spot, -sign * premium)[()]
+    if _kernels.accepts(spot):
+        kernel = _kernels.call_payoff if is_call else _kernels.put_payoff
+        return kernel(spot, strike, premium, sign)
+    leg_payoff = _call_payoff_inplace if is_call else _put_payoff_inplace
+    return leg_payoff(spot, strike, premium, np.empty_like(spot), sign)[()]
+
+
+def _leg_arrays(legs):
+    # (is_call, strike, premium, quantity) leg tuples as the strikes, premiums, coeffs and is_call arrays of the fused kernels
+    is_call, strikes, premiums, coeffs = zip(*legs)
+    return (np.array(strikes, dtype=np.float64), np.array(premiums, dtype=np.float64),
+            np.array(coeffs, dtype=np.float64), np.array(is_call, dtype=np.bool_))
+
+
+def _call_spread(spot, lower_strike, upper_strike):
+    # max(spot - lower, 0) - max(spot - upper, 0) as a single clip to [0, upper - lower]
+    out = np.subtract(spot, lower_strike, out=np.empty_like(spot))
+    return np.clip(out, 0.0, upper_strike - lower_strike, out=out)
+
+
+def _put_spread(spot, lower_strike, upper_strike):
+    # max(upper - spot, 0) - max(lower - spot, 0) as a single clip to [0, upper - lower]
+    out = np.subtract(upper_strike, spot, out=np.empty_like(spot))
+    return np.clip(out, 0.0, upper_strike - lower_strike, out=out)
+
+
+def _call_butterfly(spot, lower_strike, middle_strike, upper_strike, sign=1):
+    # Long 1C Short 2C Long 1C intrinsic value: the lower call spread minus the upper call spread
+    net_payoff = _call_spread(spot, lower_strike, middle_strike)
+    net_payoff -= _call_spread(spot, middle_strike, upper_strike)
+    if sign != 1:
+        net_payoff *= sign
+    return net_payoff
+
+
+def _call_condor(spot, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, sign=1):
+    # Long 1C Short 1C Short 1C Long 1C intrinsic value: the lower call spread minus the upper call spread
+    net_payoff = _call_spread(spot, lower_strike, lower_middle_strike)
+    net_payoff -= _call_spread(spot, upper_middle_strike, upper_strike)
+    if sign != 1:
+        net_payoff *= sign
+    return net_payoff
+
+
+def _call_backspread(spot, lower_strike, upper_strike):
+    # Short 1C at lower Long 2C at upper intrinsic value: the upper call less the call spread between the strikes
+    net_payoff = call_intrinsic(spot, upper_strike)
+    net_payoff -= _call_spread(spot, lower_strike, upper_strike)
+    return net_payoff
+
+
+def _put_backspread(spot, lower_strike, upper_strike):
+    # Short 1P at lower Long 2P at upper intrinsic value: the upper put plus the put spread between the strikes
+    net_payoff = put_intrinsic(spot, upper_strike)
+    net_payoff += _put_spread(spot, lower_strike, upper_strike)
+    return net_payoff
+
+
+def _net_payoff(spot, legs, expired=False, closed_form=None):
+    '''
+    Net payoff of a multi-leg strategy without materializing the individual legs.
+    Every leg is evaluated into one reused scratch buffer and accumulated in place,
+    unless the strategy has a closed form with fewer clamps than legs.
+
+    Args:
+        spot (float or np.ndarray): The current spot price(s) of the underlying asset
+        legs (tuple): (is_call, strike, premium, quantity) per leg, quantity negative for short legs
+        expired (bool): Whether the options have expired, leaving only the premiums
+        closed_form (callable, optional): closed_form(spot) returning the summed leg intrinsic values in one expression
+
+    Returns:
+        net_payoff (float or np.ndarray): The total net payoff
+    '''
+    spot = _as_spot(spot)
+    net_premium = sum(quantity * premium for _, _, premium, quantity in legs)
+    if not expired and _kernels.accepts_fused(spot):
+        strikes, _, coeffs, is_call = _leg_arrays(legs)
+        return _kernels.strategy_payoff(spot, strikes, coeffs, is_call, net_premium)
+    if not expired and closed_form is not None:
+        net_payoff = closed_form(spot)
+        net_payoff -= net_premium
+        return net_payoff[()]
+    net_payoff = np.zeros_like(spot)
+    if not expired:
+        scratch = np.empty_like(spot)
+        abs_scratch = np.empty_like(spot)
+        for is_call, strike, _, quantity in legs:
+            if is_call:
+                np.subtract(spot, strike, out=scratch)
+            else:
+                np.subtract(strike, spot, out=scratch)
+            _ramp(scratch, abs_scratch)
+            if quantity != 1:
+                scratch *= quantity
+            net_payoff += scratch
+    net_payoff -= net_premium
+    return net_payoff[()]
+
+
+def _vertical_spread(spot, legs, expired=False):
+    '''
+    Net payoff of a two-leg vertical spread as a single clip.
+    The net premium and the strike width are folded into the clip bounds up front,
+    so each spot price costs one subtraction and one clamp.
+
+    Args:
+        spot (float or np.ndarray): The current spot price(s) of the underlying asset
+        legs (tuple): (is_call, strike, premium, quantity) for the lower and then the upper leg
+        expired (bool): Whether the options have expired, leaving only the premiums
+
+    Returns:
+        net_payoff (float or np.ndarray): The total net payoff
+    '''
+    spot = _as_spot(spot)
+    if expired or _kernels.accepts_fused(spot):
+        return _net_payoff(spot, legs, expired)
+    (is_call, lower_strike, _, quantity), (_, upper_strike, _, _) = legs
+    net_premium = sum(leg_quantity * premium for _, _, premium, leg_quantity in legs)
+    width = upper_strike - lower_strike
+    # The call spread ramps up from the lower strike and the put spread down from the upper strike,
+    # the sign is whether the spread's intrinsic value is held long
+    anchor = lower_strike if is_call else upper_strike
+    sign = quantity if is_call else -quantity
+    max_loss = -net_premium - (width if sign < 0 else 0.0)
+    max_profit = max_loss + width
+    net_payoff = np.empty_like(spot)
+    if (sign > 0) == is_call:
+        np.subtract(spot, anchor + net_premium, out=net_payoff)
+    else:
+        np.subtract(anchor - net_premium, spot, out=net_payoff)
+    np.clip(net_payoff, max_loss, max_profit, out=net_payoff)
+    return net_payoff[()]
+
+
+def _leg_matrix(spot, legs, expired=False):
+    '''
+    Leg payoffs and their net payoff written into one contiguous (number of legs + 1, len(spot)) array.
+    Each leg is evaluated straight into its own row, and the last row is their sum.
+
+    Args:
+        spot (float or np.ndarray): The current spot price(s) of the underlying asset
+        legs (tuple): (is_call, strike, premium, quantity) per leg, quantity negative for short legs
+        expired (bool): Whether the options have expired, leaving only the premiums
+
+    Returns:
+        np.ndarray: One row per leg followed by the net payoff row
+    '''
+    spot = _as_spot(spot)
+    if spot.ndim == 0:
+        # A single spot price gets one column, so every leg still has a row to write into
+        return _leg_matrix(spot[None], legs, expired)[:, 0]
+    payoffs = np.empty((len(legs) + 1,) + spot.shape, dtype=spot.dtype)
+    if expired:
+        # Every leg is down to its premium, constant across spot
+        for row, (_, _, premium, quantity) in zip(payoffs, legs):
+            row.fill(-quantity * premium)
+    elif _kernels.accepts_fused(spot):
+        _kernels.leg_matrix(spot, *_leg_arrays(legs), out=payoffs)
+        return payoffs
+    elif _kernels.accepts(spot):
+        for row, (is_call, strike, premium, quantity) in zip(payoffs, legs):
+            kernel = _kernels.call_payoff if is_call else _kernels.put_payoff
+            kernel(spot, strike, premium, float(quantity), out=row)
+    else:
+        abs_scratch = np.empty_like(spot)
+        for row, (is_call, strike, premium, quantity) in zip(payoffs, legs):
+            leg_payoff = _call_payoff_inplace if is_call else _put_payoff_inplace
+            leg_payoff(spot, strike, premium, row, quantity, scratch=abs_scratch)
+    np.sum(payoffs[:-1], axis=0, out=payoffs[-1])
+    return payoffs
+
 
 class OptionStrategies:
-    def __init__(self, strike):
+    __slots__ = ('strike', 'premium', 'expiration', 'dtype', '_expiration_ns', '_expired_cached')
+
+    def __init__(self, strike, premium=None, expiration=None, dtype=None):
         '''
         Args:
             strike (float): Strike price of the option
-            premium (float): Paid premium for the option
-            expiration (datetime): Expiration date of the option (YYYY-MM-DD format)
+            premium (float, optional): Paid premium for the option
+            expiration (datetime, optional): Expiration date of the option (YYYY-MM-DD format)
+            dtype (np.dtype, optional): np.float32 or np.float64 payoffs, e.g. np.float32 for plotting grids.
+                Defaults to the dtype of a floating point spot array, float64 otherwise
         '''
 
         if not isinstance(strike, (int, float)):
             raise ValueError("Strike price must be a number.")
-        # if not isinstance(premium, (int, float)):
-        #     raise ValueError("Premium must be a number.")
+        if premium is not None and not isinstance(premium, (int, float)):
+            raise ValueError("Premium must be a number.")
+
+        self.strike = float(strike)
+        self.premium = float(premium) if premium is not None else None
+        self.expiration = _parse_expiration(expiration)
+        # Epoch nanoseconds, so the expiration check is one integer compare against time.time_ns()
+        self._expiration_ns = _epoch_ns(self.expiration)
+        self._expired_cached = None
+        self.dtype = _payoff_dtype(dtype) if dtype is not None else None
+
+    def _key(self):
+        return (self.strike, self.premium, self.expiration, self.dtype)
+
+    def _spot(self, spot):
+        # Spot is cast to the strategy dtype once per call, the legs then keep that dtype
+        return _as_spot(spot, self.dtype)
+
+    def _stock_pnl(self, spot, long=True):
+        # P&L of one share of the underlying bought (or sold short) at the strike price
+        return np.subtract(spot, self.strike) if long else np.subtract(self.strike, spot)
+
+    def _with_stock(self, spot, legs, long=True):
+        # Option leg rows behind a stock P&L row, with the stock added into the net payoff row
+        spot = self._spot(spot)
+        options = _leg_matrix(spot, legs, self.expired())
+        payoffs = np.empty((options.shape[0] + 1,) + options.shape[1:], dtype=options.dtype)
+        payoffs[0] = self._stock_pnl(spot, long)
+        payoffs[1:] = options
+        payoffs[-1] += payoffs[0]
+        return payoffs
+
+    def __eq__(self, other):
+        if not isinstance(other, OptionStrategies):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def expired(self):
+        '''
+        Returns:
+            bool: True if an expiration date is set and it has already passed (at the frozen clock, see refresh_clock)
+        '''
+        if self._expired_cached is not None:
+            return self._expired_cached
+        return time.time_ns() > self._expiration_ns
 
-        self.strike = strike
-        # premium = self.premium
+    def refresh_clock(self, now=None):
+        '''
+        Evaluate the expiration once and reuse it for every following payoff call,
+        instead of reading the clock in each method. Call again to move the clock.
 
+        Args:
+            now (datetime, optional): Time to evaluate the expiration at, defaults to the current time
+
+        Returns:
+            OptionStrategies: self
+        '''
+        self._expired_cached = _now_ns(now) > self._expiration_ns
+        return self
+
+    @contextmanager
+    def frozen_clock(self, now=None):
+        '''
+        Context manager freezing the expiration check for a batch of payoff calls, see refresh_clock.
+
+        Args:
+            now (datetime, optional): Time to evaluate the expiration at, defaults to the current time
+        '''
+        self.refresh_clock(now)
+        try:
+            yield self
+        finally:
+            self._expired_cached = None
 
     def long_call(self, spot, premium):
         '''
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             
         Returns:
-            net_payoff (float): The net payoff from the trade 
+            net_payoff (float or np.ndarray): The net payoff from the trade 
         '''
-        intrinsic_value = max(0, spot - self.strike)
-        net_payoff = intrinsic_value - premium
-        return net_payoff         
+        return _payoff(spot, self.strike, premium, is_call=True, is_long=True, expired=self.expired(), dtype=self.dtype)
 
     def long_put(self, spot, premium):
         '''
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             
         Returns:
-            net_payoff (float): The net payoff from the trade
+            net_payoff (float or np.ndarray): The net payoff from the trade
         '''
-        intrinsic_value = max(0, self.strike - spot)
-        net_payoff = intrinsic_value - premium
-        return net_payoff  # Profit if the spot is lower than the strike
-    
+        return _payoff(spot, self.strike, premium, is_call=False, is_long=True, expired=self.expired(), dtype=self.dtype)
+
     def short_call(self, spot, premium):
         '''
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             
         Returns:
-            net_payoff (float): The net payoff from the trade
+            net_payoff (float or np.ndarray): The net payoff from the trade
         '''
-        intrinsic_value = max(0, spot - self.strike)
-        net_payoff = premium - intrinsic_value
-        return net_payoff         
-    
+        return _payoff(spot, self.strike, premium, is_call=True, is_long=False, expired=self.expired(), dtype=self.dtype)
+
     def short_put(self, spot, premium):
         '''
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
         Returns:
-            net_payoff (float): The net payoff from the trade
+            net_payoff (float or np.ndarray): The net payoff from the trade
         '''
-        intrinsic_value = max(0, self.strike - spot)
-        net_payoff = premium - intrinsic_value
-        return net_payoff
+        return _payoff(spot, self.strike, premium, is_call=False, is_long=False, expired=self.expired(), dtype=self.dtype)
     
     def long_straddle(self, spot, call_premium, put_premium):
         '''
@@ -73,16 +482,14 @@ class OptionStrategies:
         Profits made when undelrying shows volatility to cover cost of the trade.
 
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             call_premium (float): The premium received for the short call option
             put_premium (float): The premium received for the short put option
         Returns:
-            tuple: all the payoffs
+            np.ndarray: all the payoffs, one row per leg with the net payoff last
         '''
-        long_call_payoff = self.long_call(spot, call_premium)
-        long_put_payoff = self.long_put(spot, put_premium)
-        net_payoff = long_call_payoff + long_put_payoff
-        return long_call_payoff, long_put_payoff, net_payoff
+        legs = _template_legs('long_straddle', (self.strike,), (call_premium, put_premium))
+        return _leg_matrix(self._spot(spot), legs, self.expired())
     
     def short_straddle(self, spot, call_premium, put_premium):
         '''
@@ -90,17 +497,15 @@ class OptionStrategies:
         Expects payoff characteristics similar to holding the stock. It has benefit of being much cheaper than buying the underlying outright.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             call_premium (float): The premium received for the short call option
             put_premium (float): The premium received for the short put option
         
         Returns:
-            tuple: all the payoffs 
+            np.ndarray: all the payoffs, one row per leg with the net payoff last 
         '''
-        short_call_payoff = self.short_call(spot, call_premium)
-        short_put_payoff = self.short_put(spot, put_premium)
-        net_payoff = short_call_payoff + short_put_payoff
-        return short_call_payoff, short_put_payoff, net_payoff
+        legs = _template_legs('short_straddle', (self.strike,), (call_premium, put_premium))
+        return _leg_matrix(self._spot(spot), legs, self.expired())
     
     def long_synthetic(self, spot, call_premium, put_premium):
         '''
@@ -108,395 +513,381 @@ class OptionStrategies:
         Profits made when undelrying shows volatility to cover cost of the trade.
 
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             call_premium (float): The premium received for the short call option
             put_premium (float): The premium received for the short put option
         Returns:
-            tuple: all the payoffs
+            np.ndarray: all the payoffs, one row per leg with the net payoff last
         '''
-        long_call_payoff = self.long_call(spot, call_premium)
-        short_put_payoff = self.short_put(spot, put_premium)
-        net_payoff = long_call_payoff + short_put_payoff
-        return long_call_payoff, short_put_payoff, net_payoff
-
+        legs = _template_legs('long_synthetic', (self.strike,), (call_premium, put_premium))
+        return _leg_matrix(self._spot(spot), legs, self.expired())
+    
     def short_synthetic(self, spot, call_premium, put_premium):
         '''
         Short Call and Long Put at same strike and same expiry.
         Behaves exactly like being short on underlying. 
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             call_premium (float): The premium received for the short call option
             put_premium (float): The premium received for the short put option
         
         Returns:
-            tuple: all the payoffs
+            np.ndarray: all the payoffs, one row per leg with the net payoff last
+        '''
+        legs = _template_legs('short_synthetic', (self.strike,), (call_premium, put_premium))
+        return _leg_matrix(self._spot(spot), legs, self.expired())
+    
+    def covered_call(self, spot, call_premium):
         '''
-        short_call_payoff = self.short_call(spot, call_premium)
-        long_put_payoff = self.long_put(spot, put_premium)
-        net_payoff = short_call_payoff + long_put_payoff
-        return short_call_payoff, long_put_payoff, net_payoff
+        Long the underlying at the strike price & Short Call at the same strike.
+        The premium received cushions the stock against small drops, at the cost of capping the upside.
+
+        Args:
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
+            call_premium (float): The premium received for the short call option
 
-    def bull_call_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium):
+        Returns:
+            np.ndarray: Rows of payoffs for long stock, short call, and total net payoff
+        '''
+        legs = ((True, self.strike, call_premium, -1),)
+        return self._with_stock(spot, legs)
+
+    def covered_put(self, spot, put_premium):
+        '''
+        Short the underlying at the strike price & Short Put at the same strike.
+        The premium received cushions the short stock against small rallies, at the cost of capping the downside gains.
+
+        Args:
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
+            put_premium (float): The premium received for the short put option
+
+        Returns:
+            np.ndarray: Rows of payoffs for short stock, short put, and total net payoff
+        '''
+        legs = ((False, self.strike, put_premium, -1),)
+        return self._with_stock(spot, legs, long=False)
+
+    def collar(self, spot, lower_strike, upper_strike, put_premium, call_premium):
+        '''
+        Long the underlying at the strike price, Long Put with lower strike & Short Call with higher strike.
+        The short call finances the protective put, bounding both the loss and the gain on the stock.
+
+        Args:
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
+            lower_strike (float): Strike price for the long put
+            upper_strike (float): Strike price for the short call
+            put_premium (float): Premium paid for the long put
+            call_premium (float): Premium received for the short call
+
+        Returns:
+            np.ndarray: Rows of payoffs for long stock, long put, short call, and total net payoff
+        '''
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        legs = (
+            (False, lower_strike, put_premium, 1),
+            (True, upper_strike, call_premium, -1),
+        )
+        return self._with_stock(spot, legs)
+
+    def bull_call_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium, net_only=False):
         '''
         Long Call with lower strike & Short Call with higher strike (short call)
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the long call
             upper_strike (float): Strike price for the short call
             lower_premium (float): Premium paid for the long call
             upper_premium (float): Premium received for the short call
+            net_only (bool): Only compute the total net payoff, as a single clip
             
         Returns:
-            tuple: all the payoffs
+            np.ndarray: all the payoffs, one row per leg with the net payoff last (only the net payoff if net_only)
         '''
-        
-        self.strike = lower_strike
-        long_call_payoff = self.long_call(spot, lower_premium)
-
-        self.strike = upper_strike
-        short_call_payoff = self.short_call(spot, upper_premium)
-
-        net_payoff = long_call_payoff + short_call_payoff
-
-        return long_call_payoff, short_call_payoff, net_payoff
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('bull_call_spread', (lower_strike, upper_strike), (lower_premium, upper_premium))
+        if net_only:
+            return _vertical_spread(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
     
-    def bull_put_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium):
+    def bull_put_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium, net_only=False):
         '''
         Long Put with lower strike & Short Put with higher strike
         Args:
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the long put
             upper_strike (float): Strike price for the short put
             lower_premium (float): Premium paid for the long put
             upper_premium (float): Premium received for the short put
+            net_only (bool): Only compute the total net payoff, as a single clip
             
         Returns:
-            tuple: all the payoffs
+            np.ndarray: all the payoffs, one row per leg with the net payoff last (only the net payoff if net_only)
         '''
-        self.strike = lower_strike
-        long_put_payoff = self.long_put(spot, lower_premium)
-
-        self.strike = upper_strike
-        short_put_payoff = self.short_put(spot, upper_premium)
-
-        net_payoff = long_put_payoff = short_put_payoff
-        return long_put_payoff, short_put_payoff, net_payoff
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('bull_put_spread', (lower_strike, upper_strike), (lower_premium, upper_premium))
+        if net_only:
+            return _vertical_spread(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
     
-    def bear_call_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium):
+    def bear_call_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium, net_only=False):
         '''
         Short Call with lower strike & Long Call with higher strike 
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the short call
             upper_strike (float): Strike price for the long call
             lower_premium (float): Premium received for the short call
             upper_premium (float): Premium paid for the long call
+            net_only (bool): Only compute the total net payoff, as a single clip
             
         Returns:
-            tuple: Payoffs for short call, long call, and total net payoff
+            np.ndarray: Rows of payoffs for short call, long call, and total net payoff (only the net payoff if net_only)
         '''
-        self.strike = lower_strike
-        short_call_payoff = self.short_call(spot, lower_premium)
-
-        self.strike = upper_strike
-        long_call_payoff = self.long_call(spot, upper_premium)
-
-        net_payoff = short_call_payoff + long_call_payoff        
-        return short_call_payoff, long_call_payoff, net_payoff
-
-    def bear_call_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium):
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('bear_call_spread', (lower_strike, upper_strike), (lower_premium, upper_premium))
+        if net_only:
+            return _vertical_spread(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
+    
+    def bear_put_spread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium, net_only=False):
         '''
         Short put with lower strike & Long Put at higher strike
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the short put
             upper_strike (float): Strike price for the long put
             lower_premium (float): Premium received for the short put
             upper_premium (float): Premium paid for the long put
+            net_only (bool): Only compute the total net payoff, as a single clip
         
         Returns:
-            tuple: Payoffs for long put, short put, and total net payoff
+            np.ndarray: Rows of payoffs for short put, long put, and total net payoff (only the net payoff if net_only)
         '''
-        self.strike = upper_strike 
-        long_put_payoff = self.long_put(spot, upper_premium)
-
-        self.strike = lower_premium
-        short_put_payoff = self.short_put(spot, lower_premium)
-
-        net_payoff = long_put_payoff + short_put_payoff
-        return short_put_payoff, long_put_payoff, net_payoff
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('bear_put_spread', (lower_strike, upper_strike), (lower_premium, upper_premium))
+        if net_only:
+            return _vertical_spread(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
     
-
-    def call_backspread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium):
+    def call_backspread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium, net_only=False):
         '''
         Short Call with with lower strike & Long 2 Calls with higher strike
         Works well for bullish market and/or bearish on market with bias to the upside
 
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the short call
             upper_strike (float): Strike price for the long calls
             lower_premium (float): Premium received for the short call
             upper_premium (float): Premium paid for each long call
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for short call, long calls, and total net payoff
+            np.ndarray: Rows of payoffs for short call, long calls, and total net payoff (only the net payoff if net_only)
         '''
-        self.strike = lower_strike
-        short_call_payoff = self.short_call(spot, lower_premium)
-
-        self.strike = upper_strike
-        long_call_payoff = 2 * self.long_call(spot, upper_premium)
-
-        net_payoff = short_call_payoff + long_call_payoff
-
-        return short_call_payoff, long_call_payoff, net_payoff
-
-    def put_backspread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium):
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('call_backspread', (lower_strike, upper_strike), (lower_premium, upper_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired, closed_form=lambda x: _call_backspread(x, lower_strike, upper_strike))
+        return _leg_matrix(spot, legs, expired)
+    
+    def put_backspread(self, spot, lower_strike, upper_strike, lower_premium, upper_premium, net_only=False):
         '''
         Put Backspread Strategy:
         - Sell a put at a higher strike (short put).
         - Buy two puts at a lower strike (long puts).
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the long puts
             upper_strike (float): Strike price for the short put
             lower_premium (float): Premium paid for each long put
             upper_premium (float): Premium received for the short put
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for short put, long puts, and total net payoff
+            np.ndarray: Rows of payoffs for short put, long puts, and total net payoff (only the net payoff if net_only)
         '''
-        self.strike = lower_strike
-        short_put_payoff = self.short_put(spot, lower_premium)
-
-        self.strike = upper_strike
-        long_put_payoff = 2 * self.long_put(spot, upper_premium)
-
-        net_payoff = short_put_payoff + long_put_payoff
-
-        return short_put_payoff, long_put_payoff, net_payoff
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('put_backspread', (lower_strike, upper_strike), (lower_premium, upper_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired, closed_form=lambda x: _put_backspread(x, lower_strike, upper_strike))
+        return _leg_matrix(spot, legs, expired)
     
     def long_combo(self, spot, lower_strike, upper_strike, call_premium, put_premium):
         '''
         Short Put at lower strike & Long Call at higher strike
         Quite similar to Long Synthetic (Short Put & Long Call same strike) but only with different strikes
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the short put
             upper_strike (float): Strike price for the long call
             call_premium (float): Premium paid for the long call
             put_premium (float): Premium received for the short put
         
         Returns:
-            tuple: Payoffs for long call, short put, and total net payoff
+            np.ndarray: Rows of payoffs for long call, short put, and total net payoff
         '''
-        self.strike = lower_strike
-        short_put_payoff = self.short_put(spot, put_premium)
-
-        self.strike = upper_strike
-        long_call_payoff = 2 * self.long_call(spot, call_premium)
-
-        net_payoff = short_put_payoff + long_call_payoff
-
-        return short_put_payoff, long_call_payoff, net_payoff
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('long_combo', (lower_strike, upper_strike), (call_premium, put_premium))
+        return _leg_matrix(spot, legs, expired)
     
     def long_strangle(self, spot, lower_strike, upper_strike, call_premium, put_premium):
         '''
         Long Put at lower strike & Long Call at higher strike
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the long put
             upper_strike (float): Strike price for the long call
             call_premium (float): Premium paid for the long call
             put_premium (float): Premium paid for the long put
             
         Returns:
-            tuple: Payoffs for long call, long put, and total net payoff
+            np.ndarray: Rows of payoffs for long call, long put, and total net payoff
         '''
-        self.strike = lower_strike
-        long_put_payoff = self.long_put(spot, put_premium)
-
-        self.strike = upper_strike
-        long_call_payoff = self.long_call(spot, call_premium)
-
-        net_payoff = long_call_payoff + long_put_payoff
-        return long_put_payoff, long_call_payoff, net_payoff
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('long_strangle', (lower_strike, upper_strike), (call_premium, put_premium))
+        return _leg_matrix(spot, legs, expired)
     
     def short_strangle(self, spot, lower_strike, upper_strike, call_premium, put_premium):
         '''
         Short Put at lower strike & Short Call at higher strike
 
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the short put
             upper_strike (float): Strike price for the short call
             call_premium (float): Premium received for the short call
             put_premium (float): Premium received for the short put
         
         Returns:
-            tuple: Payoffs for short call, short put, and total net payoff
+            np.ndarray: Rows of payoffs for short call, short put, and total net payoff
         '''
-        self.strike = lower_strike
-        short_put_payoff = self.short_put(spot, put_premium)
-
-        self.strike = upper_strike
-        short_call_payoff = self.short_call(spot, call_premium)
-
-        net_payoff = short_put_payoff + short_call_payoff
-        return short_put_payoff, short_call_payoff, net_payoff
+        if not lower_strike < upper_strike:
+            raise ValueError("lower_strike must be below upper_strike.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('short_strangle', (lower_strike, upper_strike), (call_premium, put_premium))
+        return _leg_matrix(spot, legs, expired)
     
     def strap(self, spot, call_premium, put_premium):
         '''
         Long 2 Calls & Long 1 Put at same strike
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             strike (float): Strike price for both calls and the put
             call_premium (float): Premium paid for each long call
             put_premium (float): Premium paid for the long put
             
         Returns:
-            tuple: Payoffs for long calls, long put, and total net payoff
+            np.ndarray: Rows of payoffs for long calls, long put, and total net payoff
         '''
-        long_call_payoff = 2 * self.long_call(spot, call_premium)  # Buy two calls
-
-        # Long one put at the same strike
-        long_put_payoff = self.long_put(spot, put_premium)
-
-        # Total net payoff is the sum of the two long calls and one long put
-        net_payoff = long_call_payoff + long_put_payoff
-    
-        return long_call_payoff, long_put_payoff, net_payoff
+        legs = _template_legs('strap', (self.strike,), (call_premium, put_premium))
+        return _leg_matrix(self._spot(spot), legs, self.expired())
     
     def strip(self, spot, call_premium, put_premium):
         '''
         Long 2 Puts & Long Call at same strike
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             strike (float): Strike price for both puts and the call
             call_premium (float): Premium paid for the long call
             put_premium (float): Premium paid for each long put
             
         Returns:
-            tuple: Payoffs for long call, long puts, and total net payoff
+            np.ndarray: Rows of payoffs for long call, long puts, and total net payoff
         '''
-        long_call_payoff = self.long_call(spot, call_premium)
-        long_put_payoff = 2 * self.long_put(spot, put_premium)
-
-        net_payoff = long_call_payoff + long_put_payoff
-        
-        return long_call_payoff, long_put_payoff, net_payoff
+        legs = _template_legs('strip', (self.strike,), (call_premium, put_premium))
+        return _leg_matrix(self._spot(spot), legs, self.expired())
     
-    def long_call_ladder(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium):
+    def long_call_ladder(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium, net_only=False):
         '''
         - Long a call at a lower strike price.
         - Short a call at a middle strike price.
         - Long a call at a higher strike price.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the lower call
             middle_strike (float): Strike price for the short call
             upper_strike (float): Strike price for the upper call
             lower_premium (float): Premium paid for the lower long call
             middle_premium (float): Premium received for the short middle call
             upper_premium (float): Premium paid for the upper long call
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for lower long call, short middle call, upper long call, and total net payoff
+            np.ndarray: Rows of payoffs for lower long call, short middle call, upper long call, and total net payoff (only the net payoff if net_only)
         '''
-        # Long call at lower strike
-        self.strike = lower_strike
-        lower_call_payoff = self.long_call(spot, lower_premium)
-
-        # Short call at middle strike
-        self.strike = middle_strike
-        middle_call_payoff = self.short_call(spot, middle_premium)
-
-        # Long call at upper strike
-        self.strike = upper_strike
-        upper_call_payoff = self.long_call(spot, upper_premium)
-
-        net_payoff = lower_call_payoff + middle_call_payoff + upper_call_payoff
-        
-        return lower_call_payoff, middle_call_payoff, upper_call_payoff, net_payoff
+        if not lower_strike < middle_strike < upper_strike:
+            raise ValueError("Strikes must be ordered lower < middle < upper.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('long_call_ladder', (lower_strike, middle_strike, upper_strike), (lower_premium, middle_premium, upper_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
     
-    def long_put_ladder(self, spot, upper_strike, middle_strike, lower_strike, upper_premium, middle_premium, lower_premium):
+    def long_put_ladder(self, spot, upper_strike, middle_strike, lower_strike, upper_premium, middle_premium, lower_premium, net_only=False):
         '''
         - Long a put at a higher strike price.
         - Short a put at a middle strike price.
         - Long a put at a lower strike price.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             upper_strike (float): Strike price for the upper put
             middle_strike (float): Strike price for the short middle put
             lower_strike (float): Strike price for the lower put
             upper_premium (float): Premium paid for the upper long put
             middle_premium (float): Premium received for the short middle put
             lower_premium (float): Premium paid for the lower long put
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for upper long put, short middle put, lower long put, and total net payoff
+            np.ndarray: Rows of payoffs for upper long put, short middle put, lower long put, and total net payoff (only the net payoff if net_only)
         '''
-        # Long put at upper strike
-        self.strike = upper_strike
-        upper_put_payoff = self.long_put(spot, upper_premium)
-
-        # Short put at middle strike
-        self.strike = middle_strike
-        middle_put_payoff = self.short_put(spot, middle_premium)
-
-        # Long put at lower strike
-        self.strike = lower_strike
-        lower_put_payoff = self.long_put(spot, lower_premium)
-
-        net_payoff = upper_put_payoff + middle_put_payoff + lower_put_payoff
-        
-        return upper_put_payoff, middle_put_payoff, lower_put_payoff, net_payoff
+        if not lower_strike < middle_strike < upper_strike:
+            raise ValueError("Strikes must be ordered lower < middle < upper.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('long_put_ladder', (upper_strike, middle_strike, lower_strike), (upper_premium, middle_premium, lower_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
     
-    def short_call_ladder(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium):
-        '''
-        Short Call Ladder Strategy:
-        - Short a call at a lower strike price.
-        - Long a call at a middle strike price.
-        - Long a call at a higher strike price.
-        
-        Args:
-            spot (float): The current spot price of the underlying asset
-            lower_strike (float): Strike price for the lower call
-            middle_strike (float): Strike price for the middle call
-            upper_strike (float): Strike price for the upper call
-            lower_premium (float): Premium received for the short lower call
-            middle_premium (float): Premium paid for the middle long call
-            upper_premium (float): Premium paid for the upper long call
-            
-        Returns:
-            tuple: Payoffs for lower short call, middle long call, upper long call, and total net payoff
-        '''
-        # Short call at lower strike
-        self.strike = lower_strike
-        lower_call_payoff = self.short_call(spot, lower_premium)
-
-        # Long call at middle strike
-        self.strike = middle_strike
-        middle_call_payoff = self.long_call(spot, middle_premium)
-
-        # Long call at upper strike
-        self.strike = upper_strike
-        upper_call_payoff = self.long_call(spot, upper_premium)
-
-        # Total net payoff
-        net_payoff = lower_call_payoff + middle_call_payoff + upper_call_payoff
-        return lower_call_payoff, middle_call_payoff, upper_call_payoff, net_payoff    
-    
-    def short_call_ladder(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium):
+    def short_call_ladder(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium, net_only=False):
         '''
         Short Call Ladder Strategy: Short C Long C Long C
         - Short a call at a lower strike price.
@@ -504,34 +895,28 @@ class OptionStrategies:
         - Long a call at a higher strike price.
 
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the lower call
             middle_strike (float): Strike price for the middle call
             upper_strike (float): Strike price for the upper call
             lower_premium (float): Premium received for the short lower call
             middle_premium (float): Premium paid for the middle long call
             upper_premium (float): Premium paid for the upper long call
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for lower short call, middle long call, upper long call, and total net payoff
+            np.ndarray: Rows of payoffs for lower short call, middle long call, upper long call, and total net payoff (only the net payoff if net_only)
         '''
-        # Short call at lower strike
-        self.strike = lower_strike
-        lower_call_payoff = self.short_call(spot, lower_premium)
-
-        # Long call at middle strike
-        self.strike = middle_strike
-        middle_call_payoff = self.long_call(spot, middle_premium)
-
-        # Long call at upper strike
-        self.strike = upper_strike
-        upper_call_payoff = self.long_call(spot, upper_premium)
-
-        # Total net payoff
-        net_payoff = lower_call_payoff + middle_call_payoff + upper_call_payoff
-        return lower_call_payoff, middle_call_payoff, upper_call_payoff, net_payoff
+        if not lower_strike < middle_strike < upper_strike:
+            raise ValueError("Strikes must be ordered lower < middle < upper.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('short_call_ladder', (lower_strike, middle_strike, upper_strike), (lower_premium, middle_premium, upper_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
     
-    def short_put_ladder(self, spot, upper_strike, middle_strike, lower_strike, upper_premium, middle_premium, lower_premium):
+    def short_put_ladder(self, spot, upper_strike, middle_strike, lower_strike, upper_premium, middle_premium, lower_premium, net_only=False):
         '''
         Short Put Ladder Strategy: Short P Long P Long P
         - Short a put at a higher strike price.
@@ -539,34 +924,28 @@ class OptionStrategies:
         - Long a put at a lower strike price.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             upper_strike (float): Strike price for the upper put
             middle_strike (float): Strike price for the middle put
             lower_strike (float): Strike price for the lower put
             upper_premium (float): Premium received for the short upper put
             middle_premium (float): Premium paid for the middle long put
             lower_premium (float): Premium paid for the lower long put
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for upper short put, middle long put, lower long put, and total net payoff
+            np.ndarray: Rows of payoffs for upper short put, middle long put, lower long put, and total net payoff (only the net payoff if net_only)
         '''
-        # Short put at upper strike
-        self.strike = upper_strike
-        upper_put_payoff = self.short_put(spot, upper_premium)
-
-        # Long put at middle strike
-        self.strike = middle_strike
-        middle_put_payoff = self.long_put(spot, middle_premium)
-
-        # Long put at lower strike
-        self.strike = lower_strike
-        lower_put_payoff = self.long_put(spot, lower_premium)
-
-        # Total net payoff
-        net_payoff = upper_put_payoff + middle_put_payoff + lower_put_payoff
-        return upper_put_payoff, middle_put_payoff, lower_put_payoff, net_payoff
+        if not lower_strike < middle_strike < upper_strike:
+            raise ValueError("Strikes must be ordered lower < middle < upper.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('short_put_ladder', (upper_strike, middle_strike, lower_strike), (upper_premium, middle_premium, lower_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired)
+        return _leg_matrix(spot, legs, expired)
     
-    def long_call_butterfly(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium):
+    def long_call_butterfly(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium, net_only=False):
         '''
         Long Call Butterfly Strategy: Long 1C Short 2C Long 1C
         - Long a call at a lower strike price.
@@ -574,34 +953,28 @@ class OptionStrategies:
         - Long a call at a higher strike price.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the lower call
             middle_strike (float): Strike price for the middle short calls
             upper_strike (float): Strike price for the upper call
             lower_premium (float): Premium paid for the lower long call
             middle_premium (float): Premium received for the middle short calls
             upper_premium (float): Premium paid for the upper long call
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for lower long call, middle short calls, upper long call, and total net payoff
+            np.ndarray: Rows of payoffs for lower long call, middle short calls, upper long call, and total net payoff (only the net payoff if net_only)
         '''
-        # Long call at lower strike
-        self.strike = lower_strike
-        lower_call_payoff = self.long_call(spot, lower_premium)
-
-        # Short two calls at middle strike
-        self.strike = middle_strike
-        middle_call_payoff = 2 * self.short_call(spot, middle_premium)
-
-        # Long call at upper strike
-        self.strike = upper_strike
-        upper_call_payoff = self.long_call(spot, upper_premium)
-
-        # Total net payoff
-        net_payoff = lower_call_payoff + middle_call_payoff + upper_call_payoff
-        return lower_call_payoff, middle_call_payoff, upper_call_payoff, net_payoff
+        if not lower_strike < middle_strike < upper_strike:
+            raise ValueError("Strikes must be ordered lower < middle < upper.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('long_call_butterfly', (lower_strike, middle_strike, upper_strike), (lower_premium, middle_premium, upper_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired, closed_form=lambda x: _call_butterfly(x, lower_strike, middle_strike, upper_strike))
+        return _leg_matrix(spot, legs, expired)
     
-    def short_call_butterfly(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium):
+    def short_call_butterfly(self, spot, lower_strike, middle_strike, upper_strike, lower_premium, middle_premium, upper_premium, net_only=False):
         '''
         Short Call Butterfly Strategy: Short 1C Long2C Short 1C
         - Short a call at a lower strike price.
@@ -609,34 +982,65 @@ class OptionStrategies:
         - Short a call at a higher strike price.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the lower call
             middle_strike (float): Strike price for the middle long calls
             upper_strike (float): Strike price for the upper call
             lower_premium (float): Premium received for the lower short call
             middle_premium (float): Premium paid for the middle long calls
             upper_premium (float): Premium received for the upper short call
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for lower short call, middle long calls, upper short call, and total net payoff
+            np.ndarray: Rows of payoffs for lower short call, middle long calls, upper short call, and total net payoff (only the net payoff if net_only)
+        '''
+        if not lower_strike < middle_strike < upper_strike:
+            raise ValueError("Strikes must be ordered lower < middle < upper.")
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = _template_legs('short_call_butterfly', (lower_strike, middle_strike, upper_strike), (lower_premium, middle_premium, upper_premium))
+        if net_only:
+            return _net_payoff(spot, legs, expired, closed_form=lambda x: _call_butterfly(x, lower_strike, middle_strike, upper_strike, -1))
+        return _leg_matrix(spot, legs, expired)
+    
+    @staticmethod
+    def _call_condor_legs(lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, lower_premium, lower_middle_premium, upper_middle_premium, upper_premium, sign):
+        # Legs of a call condor, sign is 1 for the long condor and -1 for the short condor
+        if not lower_strike < lower_middle_strike < upper_middle_strike < upper_strike:
+            raise ValueError("Strikes must be ordered lower < lower middle < upper middle < upper.")
+        return _template_legs(
+            'long_call_condor' if sign > 0 else 'short_call_condor',
+            (lower_strike, lower_middle_strike, upper_middle_strike, upper_strike),
+            (lower_premium, lower_middle_premium, upper_middle_premium, upper_premium),
+        )
+
+    @staticmethod
+    def call_condor_payoff(spot, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, lower_premium, lower_middle_premium, upper_middle_premium, upper_premium, sign=1):
         '''
-        # Short call at lower strike
-        self.strike = lower_strike
-        lower_call_payoff = self.short_call(spot, lower_premium)
+        Stateless net payoff of a call condor held to expiry, without an OptionStrategies instance.
+        It only reads its arguments, so many condors can be priced concurrently, e.g. from a ThreadPoolExecutor.
 
-        # Long two calls at middle strike
-        self.strike = middle_strike
-        middle_call_payoff = 2 * self.long_call(spot, middle_premium)
+        Args:
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
+            lower_strike (float): Strike price for the lower call
+            lower_middle_strike (float): Strike price for the lower middle call
+            upper_middle_strike (float): Strike price for the upper middle call
+            upper_strike (float): Strike price for the higher call
+            lower_premium (float): Premium of the lower call
+            lower_middle_premium (float): Premium of the lower middle call
+            upper_middle_premium (float): Premium of the upper middle call
+            upper_premium (float): Premium of the higher call
+            sign (int): 1 for a long call condor, -1 for a short call condor
 
-        # Short call at upper strike
-        self.strike = upper_strike
-        upper_call_payoff = self.short_call(spot, upper_premium)
+        Returns:
+            net_payoff (float or np.ndarray): The total net payoff
+        '''
+        return _net_payoff(spot, OptionStrategies._call_condor_legs(
+            lower_strike, lower_middle_strike, upper_middle_strike, upper_strike,
+            lower_premium, lower_middle_premium, upper_middle_premium, upper_premium, sign,
+        ), closed_form=lambda x: _call_condor(x, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, sign))
 
-        # Total net payoff
-        net_payoff = lower_call_payoff + middle_call_payoff + upper_call_payoff
-        return lower_call_payoff, middle_call_payoff, upper_call_payoff, net_payoff
-    
-    def long_call_condor(self, spot, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, lower_premium, lower_middle_premium, upper_middle_premium, upper_premium):
+    def long_call_condor(self, spot, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, lower_premium, lower_middle_premium, upper_middle_premium, upper_premium, net_only=False):
         '''
         Long Call Condor Strategy: Long 1C Short 1C Short 1C Long 1C
         - Long a call at a lower strike price.
@@ -645,7 +1049,7 @@ class OptionStrategies:
         - Long a call at a higher strike price.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the lower call
             lower_middle_strike (float): Strike price for the lower middle call
             upper_middle_strike (float): Strike price for the upper middle call
@@ -654,31 +1058,22 @@ class OptionStrategies:
             lower_middle_premium (float): Premium received for the lower middle short call
             upper_middle_premium (float): Premium received for the upper middle short call
             upper_premium (float): Premium paid for the higher long call
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for lower long call, lower middle short call, upper middle short call, higher long call, and total net payoff
+            np.ndarray: Rows of payoffs for lower long call, lower middle short call, upper middle short call, higher long call, and total net payoff (only the net payoff if net_only)
         '''
-        # Long call at lower strike
-        self.strike = lower_strike
-        lower_call_payoff = self.long_call(spot, lower_premium)
-
-        # Short call at lower middle strike
-        self.strike = lower_middle_strike
-        lower_middle_call_payoff = self.short_call(spot, lower_middle_premium)
-
-        # Short call at upper middle strike
-        self.strike = upper_middle_strike
-        upper_middle_call_payoff = self.short_call(spot, upper_middle_premium)
-
-        # Long call at higher strike
-        self.strike = upper_strike
-        upper_call_payoff = self.long_call(spot, upper_premium)
-
-        # Total net payoff
-        net_payoff = lower_call_payoff + lower_middle_call_payoff + upper_middle_call_payoff + upper_call_payoff
-        return lower_call_payoff, lower_middle_call_payoff, upper_middle_call_payoff, upper_call_payoff, net_payoff
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = self._call_condor_legs(
+            lower_strike, lower_middle_strike, upper_middle_strike, upper_strike,
+            lower_premium, lower_middle_premium, upper_middle_premium, upper_premium, 1,
+        )
+        if net_only:
+            return _net_payoff(spot, legs, expired, closed_form=lambda x: _call_condor(x, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike))
+        return _leg_matrix(spot, legs, expired)
     
-    def short_call_condor(self, spot, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, lower_premium, lower_middle_premium, upper_middle_premium, upper_premium):
+    def short_call_condor(self, spot, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, lower_premium, lower_middle_premium, upper_middle_premium, upper_premium, net_only=False):
         '''
         Short Call Condor Strategy: Short 1C Long 1C Long 1C Short 1C
         - Short a call at a lower strike price.
@@ -687,7 +1082,7 @@ class OptionStrategies:
         - Short a call at a higher strike price.
         
         Args:
-            spot (float): The current spot price of the underlying asset
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
             lower_strike (float): Strike price for the lower short call
             lower_middle_strike (float): Strike price for the lower middle long call
             upper_middle_strike (float): Strike price for the upper middle long call
@@ -696,26 +1091,429 @@ class OptionStrategies:
             lower_middle_premium (float): Premium paid for the lower middle long call
             upper_middle_premium (float): Premium paid for the upper middle long call
             upper_premium (float): Premium received for the higher short call
+            net_only (bool): Only compute the total net payoff, in a single buffer
             
         Returns:
-            tuple: Payoffs for lower short call, lower middle long call, upper middle long call, higher short call, and total net payoff
+            np.ndarray: Rows of payoffs for lower short call, lower middle long call, upper middle long call, higher short call, and total net payoff (only the net payoff if net_only)
         '''
-        # Short call at lower strike
-        self.strike = lower_strike
-        lower_call_payoff = self.short_call(spot, lower_premium)
+        spot = self._spot(spot)
+        expired = self.expired()
+        legs = self._call_condor_legs(
+            lower_strike, lower_middle_strike, upper_middle_strike, upper_strike,
+            lower_premium, lower_middle_premium, upper_middle_premium, upper_premium, -1,
+        )
+        if net_only:
+            return _net_payoff(spot, legs, expired, closed_form=lambda x: _call_condor(x, lower_strike, lower_middle_strike, upper_middle_strike, upper_strike, -1))
+        return _leg_matrix(spot, legs, expired)
+
+
+# Leg layout of each strategy as (is_call, quantity, strike column, premium column) per leg.
+# Quantity is negative for short legs. The columns index the strategy method's strike and
+# premium arguments in signature order, e.g. bull_call_spread(lower_strike, upper_strike,
+# lower_premium, upper_premium) has strike columns (lower, upper) and premium columns (lower, upper).
+# This is the one definition of each layout: the OptionStrategies methods build their legs from it.
+STRATEGY_TEMPLATES = {
+    'long_call': ((True, 1, 0, 0),),
+    'long_put': ((False, 1, 0, 0),),
+    'short_call': ((True, -1, 0, 0),),
+    'short_put': ((False, -1, 0, 0),),
+    'long_straddle': ((True, 1, 0, 0), (False, 1, 0, 1)),
+    'short_straddle': ((True, -1, 0, 0), (False, -1, 0, 1)),
+    'long_synthetic': ((True, 1, 0, 0), (False, -1, 0, 1)),
+    'short_synthetic': ((True, -1, 0, 0), (False, 1, 0, 1)),
+    'strap': ((True, 2, 0, 0), (False, 1, 0, 1)),
+    'strip': ((True, 1, 0, 0), (False, 2, 0, 1)),
+    'bull_call_spread': ((True, 1, 0, 0), (True, -1, 1, 1)),
+    'bull_put_spread': ((False, 1, 0, 0), (False, -1, 1, 1)),
+    'bear_call_spread': ((True, -1, 0, 0), (True, 1, 1, 1)),
+    'bear_put_spread': ((False, -1, 0, 0), (False, 1, 1, 1)),
+    'call_backspread': ((True, -1, 0, 0), (True, 2, 1, 1)),
+    'put_backspread': ((False, -1, 0, 0), (False, 2, 1, 1)),
+    'long_combo': ((False, -1, 0, 1), (True, 1, 1, 0)),
+    'long_strangle': ((False, 1, 0, 1), (True, 1, 1, 0)),
+    'short_strangle': ((False, -1, 0, 1), (True, -1, 1, 0)),
+    'long_call_ladder': ((True, 1, 0, 0), (True, -1, 1, 1), (True, 1, 2, 2)),
+    'long_put_ladder': ((False, 1, 0, 0), (False, -1, 1, 1), (False, 1, 2, 2)),
+    'short_call_ladder': ((True, -1, 0, 0), (True, 1, 1, 1), (True, 1, 2, 2)),
+    'short_put_ladder': ((False, -1, 0, 0), (False, 1, 1, 1), (False, 1, 2, 2)),
+    'long_call_butterfly': ((True, 1, 0, 0), (True, -2, 1, 1), (True, 1, 2, 2)),
+    'short_call_butterfly': ((True, -1, 0, 0), (True, 2, 1, 1), (True, -1, 2, 2)),
+    'long_call_condor': ((True, 1, 0, 0), (True, -1, 1, 1), (True, -1, 2, 2), (True, 1, 3, 3)),
+    'short_call_condor': ((True, -1, 0, 0), (True, 1, 1, 1), (True, 1, 2, 2), (True, -1, 3, 3)),
+}
+
+
+def _template_legs(strategy_name, strikes, premiums):
+    # (is_call, strike, premium, quantity) legs of a strategy, picked out of its arguments by STRATEGY_TEMPLATES
+    return tuple(
+        (is_call, strikes[strike_column], premiums[premium_column], quantity)
+        for is_call, quantity, strike_column, premium_column in STRATEGY_TEMPLATES[strategy_name]
+    )
+
+
+def evaluate_batch(strategy_name, spot, strikes, premiums):
+    '''
+    Net payoff of many parameterizations of one strategy in a single broadcast,
+    e.g. scanning a ladder of strikes without a Python loop over OptionStrategies calls.
+
+    Args:
+        strategy_name (str): Key of STRATEGY_TEMPLATES, i.e. the OptionStrategies method name
+        spot (np.ndarray): 1-D spot prices of the underlying asset, shape (M,)
+        strikes (np.ndarray): Strike arguments per parameterization, shape (N, number of strikes)
+        premiums (np.ndarray): Premium arguments per parameterization, shape (N, number of premiums)
+
+    Returns:
+        np.ndarray: Net payoffs, shape (N, M)
+    '''
+    if strategy_name not in STRATEGY_TEMPLATES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+    legs = STRATEGY_TEMPLATES[strategy_name]
+
+    spot = _as_spot(spot)
+    strikes = np.asarray(strikes, dtype=spot.dtype)
+    premiums = np.asarray(premiums, dtype=spot.dtype)
+    if spot.ndim != 1 or strikes.ndim != 2 or premiums.ndim != 2:
+        raise ValueError("spot must be 1-D and strikes/premiums must be 2-D.")
+
+    # Premiums do not depend on spot, so their weighted sum is one (N,) vector
+    quantities = np.zeros(premiums.shape[1], dtype=spot.dtype)
+    for _, quantity, _, premium_column in legs:
+        quantities[premium_column] += quantity
+    net_payoff = np.empty((strikes.shape[0], spot.shape[0]), dtype=spot.dtype)
+    net_payoff[:] = -(premiums @ quantities)[:, None]
+
+    scratch = np.empty_like(net_payoff)
+    is_vertical = len(legs) == 2 and legs[0][0] == legs[1][0] and abs(legs[0][1]) == 1 and legs[0][1] == -legs[1][1]
+    # The clip needs lower <= upper on every row, unordered rows go through the per-leg ramps below
+    if is_vertical and np.all(strikes[:, legs[0][2]] <= strikes[:, legs[1][2]]):
+        # A vertical spread's two ramps collapse into one clip to [0, upper - lower] per parameterization
+        is_call, quantity, lower_column, _ = legs[0]
+        lower_strikes = strikes[:, lower_column, None]
+        upper_strikes = strikes[:, legs[1][2], None]
+        if is_call:
+            np.subtract(spot[None, :], lower_strikes, out=scratch)
+        else:
+            np.subtract(upper_strikes, spot[None, :], out=scratch)
+            quantity = -quantity
+        np.clip(scratch, 0.0, upper_strikes - lower_strikes, out=scratch)
+        if quantity > 0:
+            net_payoff += scratch
+        else:
+            net_payoff -= scratch
+        return net_payoff
 
-        # Long call at lower middle strike
-        self.strike = lower_middle_strike
-        lower_middle_call_payoff = self.long_call(spot, lower_middle_premium)
+    abs_scratch = np.empty_like(net_payoff)
+    for is_call, quantity, strike_column, _ in legs:
+        leg_strikes = strikes[:, strike_column, None]
+        if is_call:
+            np.subtract(spot[None, :], leg_strikes, out=scratch)
+        else:
+            np.subtract(leg_strikes, spot[None, :], out=scratch)
+        _ramp(scratch, abs_scratch)
+        if quantity != 1:
+            scratch *= quantity
+        net_payoff += scratch
+    return net_payoff
+
+
+class StrategySpec(NamedTuple):
+    '''
+    A strategy with its parameters fixed, one entry per leg.
+    The premiums are folded into net_premium so evaluating the spec only touches spot.
+    '''
+    strikes: np.ndarray
+    coeffs: np.ndarray
+    net_premium: float
+    opt_types: np.ndarray
+    premiums: np.ndarray
+
+
+def build_spec(strategy_name, strikes, premiums):
+    '''
+    Freeze one parameterization of a strategy into a StrategySpec.
+
+    Args:
+        strategy_name (str): Key of STRATEGY_TEMPLATES, i.e. the OptionStrategies method name
+        strikes (sequence): Strike arguments in the order the strategy method takes them
+        premiums (sequence): Premium arguments in the order the strategy method takes them
+
+    Returns:
+        StrategySpec: Leg strikes, leg quantities, the net premium, the leg types (True for calls) and the leg premiums
+    '''
+    if strategy_name not in STRATEGY_TEMPLATES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+    legs = STRATEGY_TEMPLATES[strategy_name]
+    coeffs = np.array([quantity for _, quantity, _, _ in legs], dtype=np.float64)
+    return StrategySpec(
+        strikes=np.array([strikes[strike_column] for _, _, strike_column, _ in legs], dtype=np.float64),
+        coeffs=coeffs,
+        net_premium=float(sum(quantity * premiums[premium_column] for _, quantity, _, premium_column in legs)),
+        opt_types=np.array([is_call for is_call, _, _, _ in legs]),
+        premiums=np.array([premiums[premium_column] for _, _, _, premium_column in legs], dtype=np.float64),
+    )
+
+
+def evaluate_spec(spot, spec):
+    '''
+    Net payoff of a prebuilt StrategySpec.
+
+    Args:
+        spot (float or np.ndarray): The current spot price(s) of the underlying asset
+        spec (StrategySpec): Strategy built by build_spec
+
+    Returns:
+        net_payoff (float or np.ndarray): The total net payoff
+    '''
+    spot = _as_spot(spot)
+    dtype = spot.dtype
+    # Moneyness of every leg as one (legs, spots) matrix, flipped for the puts
+    intrinsic_value = np.subtract(spot.reshape(1, -1), spec.strikes.astype(dtype)[:, None])
+    intrinsic_value *= np.where(spec.opt_types, 1, -1).astype(dtype)[:, None]
+    _ramp(intrinsic_value)
+    # The signed leg quantities sum the legs in one matrix-vector product
+    net_payoff = spec.coeffs.astype(dtype) @ intrinsic_value
+    net_payoff -= spec.net_premium
+    return net_payoff.reshape(spot.shape)[()]
+
+
+# Scenarios below which payoff_mc stays in process without Numba. Starting a pool costs ~20 ms
+# while evaluate_spec prices 50-75M scenarios per second on one core, so sharding only wins in the millions.
+_POOL_MIN_SCENARIOS = 2_000_000
+
+
+def payoff_mc(spec, terminal_spots, processes=None):
+    '''
+    Net payoff of a StrategySpec across Monte-Carlo terminal spot prices.
+    In process, the compiled kernel splits the scenarios across cores with no pickling.
+    Without Numba the scenarios are priced in process by evaluate_spec. They are only sharded
+    across a multiprocessing pool when processes is given (e.g. spots streamed from an external
+    simulator), or when more than one worker is available and the run has at least
+    _POOL_MIN_SCENARIOS scenarios, enough to pay for spawning the workers and pickling the shards.
+
+    Args:
+        spec (StrategySpec): Strategy built by build_spec
+        terminal_spots (float or np.ndarray): Simulated terminal spot prices, a scalar counts as one scenario
+        processes (int, optional): Worker processes for the pool, defaults to cpu_count() - 1
+
+    Returns:
+        np.ndarray: Net payoff per scenario
+    '''
+    terminal_spots = np.atleast_1d(_as_spot(terminal_spots))
+    if processes is None:
+        if _kernels.accepts_fused(terminal_spots):
+            return _kernels.strategy_payoff(terminal_spots, spec.strikes, spec.coeffs, spec.opt_types, spec.net_premium)
+        processes = max((os.cpu_count() or 1) - 1, 1)
+        if processes == 1 or terminal_spots.size < _POOL_MIN_SCENARIOS:
+            return evaluate_spec(terminal_spots, spec)
+
+    # Imported here since only the pool fallback needs it
+    from multiprocessing import Pool
+
+    shards = np.array_split(terminal_spots, processes)
+    with Pool(processes) as pool:
+        return np.concatenate(pool.map(partial(evaluate_spec, spec=spec), shards))
+
+
+def batch_payoff(positions, spot, max_workers=10):
+    '''
+    Net payoff of many independent positions over one spot grid, one position per thread task.
+    The serial compiled kernel and the NumPy ufuncs release the GIL, so the threads run in parallel.
+
+    Args:
+        positions (iterable): StrategySpec instances, or (strategy_name, strikes, premiums) tuples as taken by build_spec
+        spot (np.ndarray): 1-D spot prices of the underlying asset
+        max_workers (int): Threads in the pool
+
+    Returns:
+        np.ndarray: Net payoffs, one row per position
+    '''
+    specs = [p if isinstance(p, StrategySpec) else build_spec(*p) for p in positions]
+    spot = _as_spot(spot)
+    if spot.ndim != 1:
+        raise ValueError("spot must be 1-D.")
+    net_payoff = np.empty((len(specs), spot.shape[0]), dtype=spot.dtype)
+    fused = _kernels.accepts_fused(spot)
+
+    def evaluate_row(row):
+        spec = specs[row]
+        if fused:
+            # Each thread already owns a core, so the kernel stays serial
+            _kernels.strategy_payoff(spot, spec.strikes, spec.coeffs, spec.opt_types, spec.net_premium, out=net_payoff[row], parallel=False)
+        else:
+            net_payoff[row] = evaluate_spec(spot, spec)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # list() surfaces any exception raised inside a task
+        list(pool.map(evaluate_row, range(len(specs))))
+    return net_payoff
+
+
+def payoff_gpu(spec, spot):
+    '''
+    Net payoff of a StrategySpec on the GPU, for spot grids of tens of millions of scenarios.
+    Requires CuPy. Host arrays are copied to the device; the result stays there (cupy.asnumpy to fetch it).
+
+    Args:
+        spec (StrategySpec): Strategy built by build_spec
+        spot (np.ndarray or cupy.ndarray): 1-D spot prices, float32 halves the device memory traffic
+
+    Returns:
+        cupy.ndarray: Net payoff per spot price
+    '''
+    import cupy as cp
+
+    spot = cp.asarray(spot)
+    if spot.dtype.kind != 'f':
+        spot = spot.astype(np.float64)
+    return _kernels.strategy_payoff_gpu(spot, spec.strikes, spec.coeffs, spec.opt_types, spec.net_premium)
+
+
+class Portfolio:
+    '''
+    A book of option legs stored as parallel arrays (structure of arrays), one entry per leg,
+    so the whole book is priced over a spot grid in one broadcast instead of one call per position.
+    '''
+    __slots__ = ('strikes', 'premiums', 'quantities', 'is_call', 'expired', 'expirations_ns', 'net_premium', 'dtype', '_live_quantities', '_signs')
+
+    def __init__(self, strikes, premiums, quantities, is_call, expired=None, expirations=None, dtype=None):
+        '''
+        Args:
+            strikes (array-like): Strike price per leg
+            premiums (array-like): Premium per leg
+            quantities (array-like): Signed quantity per leg, 1 for long and -1 for short
+            is_call (array-like): True for call legs, False for put legs
+            expired (array-like, optional): True for legs that have expired and only keep their premium
+            expirations (sequence, optional): Expiration date per leg (datetime, YYYY-MM-DD string or None),
+                checked against the clock once per payoff call
+            dtype (np.dtype, optional): np.float32 or np.float64 leg arrays and payoffs, e.g. np.float32 to halve
+                the memory traffic of large scenario grids. The legs are still summed in float64.
+        '''
+        self.dtype = _payoff_dtype(dtype) if dtype is not None else np.dtype(np.float64)
+        self.strikes = np.asarray(strikes, dtype=self.dtype)
+        self.premiums = np.asarray(premiums, dtype=self.dtype)
+        self.quantities = np.asarray(quantities, dtype=self.dtype)
+        self.is_call = np.asarray(is_call, dtype=np.bool_)
+        self.expired = np.zeros(self.strikes.shape, dtype=np.bool_) if expired is None else np.asarray(expired, dtype=np.bool_)
+        if not (self.strikes.shape == self.premiums.shape == self.quantities.shape == self.is_call.shape == self.expired.shape) or self.strikes.ndim != 1:
+            raise ValueError("strikes, premiums, quantities, is_call and expired must be 1-D arrays of the same length.")
+        # Premiums do not depend on spot, so the whole book pays one constant, summed in float64
+        self.net_premium = float(self.premiums.astype(np.float64) @ self.quantities.astype(np.float64))
+        # Expiration dates as int64 epoch nanoseconds, so the dead mask is one vectorized integer compare
+        self.expirations_ns = None
+        if expirations is not None:
+            self.expirations_ns = np.array([_epoch_ns(_parse_expiration(e)) for e in expirations], dtype=np.int64)
+            if self.expirations_ns.shape != self.strikes.shape:
+                raise ValueError("expirations must have one entry per leg.")
+        # Expired legs get a zero weight on their intrinsic value, a select decided once per book instead of per spot
+        self._live_quantities = np.where(self.expired, 0.0, self.quantities)
+        # Moneyness sign per leg, +1 for calls and -1 for puts
+        self._signs = np.where(self.is_call, 1, -1).astype(self.dtype)
+
+    @classmethod
+    def from_strategies(cls, positions, dtype=None):
+        '''
+        Flatten strategies into one portfolio, e.g. a long_call_butterfly contributes its three legs.
+
+        Args:
+            positions (iterable): StrategySpec instances, or (strategy_name, strikes, premiums) tuples as taken by build_spec
+            dtype (np.dtype, optional): Floating point type of the portfolio, see Portfolio
+
+        Returns:
+            Portfolio: The legs of every position
+        '''
+        specs = [p if isinstance(p, StrategySpec) else build_spec(*p) for p in positions]
+        if not specs:
+            return cls((), (), (), (), dtype=dtype)
+        return cls(
+            np.concatenate([spec.strikes for spec in specs]),
+            np.concatenate([spec.premiums for spec in specs]),
+            np.concatenate([spec.coeffs for spec in specs]),
+            np.concatenate([spec.opt_types for spec in specs]),
+            dtype=dtype,
+        )
+
+    def __len__(self):
+        return self.strikes.shape[0]
+
+    def live_quantities(self, now=None):
+        '''
+        Leg weights on the intrinsic values, zero for expired legs. With expirations the clock is read once here.
 
-        # Long call at upper middle strike
-        self.strike = upper_middle_strike
-        upper_middle_call_payoff = self.long_call(spot, upper_middle_premium)
+        Args:
+            now (datetime, optional): Time to evaluate the expirations at, defaults to the current time
 
-        # Short call at higher strike
-        self.strike = upper_strike
-        upper_call_payoff = self.short_call(spot, upper_premium)
+        Returns:
+            np.ndarray: Signed quantity per leg, zeroed where the leg has expired
+        '''
+        if self.expirations_ns is None:
+            return self._live_quantities
+        return np.where(self.expired | (self.expirations_ns < _now_ns(now)), 0.0, self.quantities)
 
-        # Total net payoff
-        net_payoff = lower_call_payoff + lower_middle_call_payoff + upper_middle_call_payoff + upper_call_payoff
-        return lower_call_payoff, lower_middle_call_payoff, upper_middle_call_payoff, upper_call_payoff, net_payoff
\ No newline at end of file
+    def workspace(self, n_spots):
+        '''
+        Scratch buffers for payoff, so repeated pricing on grids of n_spots reuses them instead of
+        allocating two (spots, legs) arrays per call. The caller owns them: they are freed with the
+        workspace, and concurrent payoff calls each need their own.
+
+        Args:
+            n_spots (int): Number of spot prices the workspace is for
+
+        Returns:
+            tuple: The moneyness and |moneyness| buffers, both shaped (n_spots, number of legs)
+        '''
+        shape = (n_spots, self.strikes.shape[0])
+        return np.empty(shape, dtype=self.dtype), np.empty(shape, dtype=self.dtype)
+
+    def compile(self):
+        '''
+        Specialize a compiled payoff function to this portfolio's shape, see _kernels.compile_book.
+        The first call of a new shape pays the compilation, later calls and books of the same shape do not.
+        Without Numba this is just the vectorized payoff.
+
+        Returns:
+            callable: payoff(spot, now=None) with the same result as Portfolio.payoff
+        '''
+        if not _kernels.has_numba():
+            return self.payoff
+        kernel = _kernels.compile_book(self.is_call)
+
+        def payoff(spot, now=None):
+            spot = _as_spot(spot, self.dtype)
+            if not _kernels.accepts_fused(spot):
+                return self.payoff(spot, now)
+            return kernel(spot, self.strikes, self.live_quantities(now), self.net_premium)
+
+        return payoff
+
+    def payoff(self, spot, now=None, workspace=None):
+        '''
+        Net payoff of the whole portfolio.
+
+        Args:
+            spot (float or np.ndarray): The current spot price(s) of the underlying asset
+            now (datetime, optional): Time to evaluate the expirations at, defaults to the current time
+            workspace (tuple, optional): Buffers from workspace(len(spot)) for the NumPy path, allocated per call if not given
+
+        Returns:
+            net_payoff (float or np.ndarray): The total net payoff of all legs
+        '''
+        live_quantities = self.live_quantities(now)
+        spot = _as_spot(spot, self.dtype)
+        if _kernels.accepts_precompiled(spot):
+            return _kernels.portfolio_payoff(spot, self.strikes, live_quantities, self.is_call, self.net_premium)
+        if workspace is None:
+            workspace = self.workspace(spot.size)
+        elif workspace[0].shape != (spot.size, len(self)) or workspace[0].dtype != self.dtype:
+            raise ValueError("workspace must come from workspace(len(spot)) of this portfolio.")
+        # (spots, legs) moneyness in one broadcast, flipped for the puts, all in the workspace buffers
+        intrinsic_value, abs_scratch = workspace
+        np.subtract(spot.reshape(-1, 1), self.strikes, out=intrinsic_value)
+        intrinsic_value *= self._signs
+        _ramp(intrinsic_value, abs_scratch)
+        if self.dtype == np.float64:
+            net_payoff = intrinsic_value @ live_quantities
+        else:
+            # Narrow payoffs are summed over the legs in a float64 accumulator, so the error does not grow with the book
+            net_payoff = np.einsum('ij,j->i', intrinsic_value, live_quantities, dtype=np.float64)
+        net_payoff -= self.net_premium
+        return net_payoff.astype(self.dtype, copy=False).reshape(spot.shape)[()]
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from option_strategies import batch_payoff, evaluate_batch
+
+
+def test_vertical_spread_rows_match_batch_payoff():
+    # Unordered strikes must not be clipped to a negative width
+    spot = np.array([50.0, 100.0, 150.0])
+    strikes = np.array([[110.0, 90.0], [90.0, 110.0]])
+    premiums = np.array([[0.0, 0.0], [7.0, 3.0]])
+    for name in ('bull_call_spread', 'bull_put_spread', 'bear_call_spread', 'bear_put_spread'):
+        expected = batch_payoff([(name, k, p) for k, p in zip(strikes, premiums)], spot)
+        np.testing.assert_allclose(evaluate_batch(name, spot, strikes, premiums), expected)